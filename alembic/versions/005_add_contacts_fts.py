@@ -0,0 +1,104 @@
+"""Add contacts_fts full-text index (SQLite FTS5) with sync triggers
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One FTS row per contact (rowid = contacts.id). company_name mirrors the linked Company.name.
+_CONTACT_FTS_VALUES = """
+    new.id,
+    new.full_name,
+    coalesce(new.email, ''),
+    coalesce(new.company, ''),
+    coalesce((SELECT name FROM companies WHERE id = new.company_id), '')
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE contacts_fts USING fts5(
+            full_name, email, company, company_name,
+            prefix = '2 3',
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    # Rank name matches above email and company matches (bm25 column weights).
+    op.execute("INSERT INTO contacts_fts(contacts_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0, 2.0)')")
+    op.execute(
+        """
+        INSERT INTO contacts_fts(rowid, full_name, email, company, company_name)
+        SELECT contacts.id, contacts.full_name, coalesce(contacts.email, ''),
+               coalesce(contacts.company, ''), coalesce(companies.name, '')
+        FROM contacts LEFT JOIN companies ON companies.id = contacts.company_id
+        """
+    )
+
+    op.execute(
+        f"""
+        CREATE TRIGGER contacts_fts_after_insert AFTER INSERT ON contacts BEGIN
+            INSERT INTO contacts_fts(rowid, full_name, email, company, company_name)
+            VALUES ({_CONTACT_FTS_VALUES});
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER contacts_fts_after_update
+        AFTER UPDATE OF full_name, email, company, company_id ON contacts BEGIN
+            DELETE FROM contacts_fts WHERE rowid = old.id;
+            INSERT INTO contacts_fts(rowid, full_name, email, company, company_name)
+            VALUES ({_CONTACT_FTS_VALUES});
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER contacts_fts_after_delete AFTER DELETE ON contacts BEGIN
+            DELETE FROM contacts_fts WHERE rowid = old.id;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER contacts_fts_after_company_rename AFTER UPDATE OF name ON companies BEGIN
+            UPDATE contacts_fts SET company_name = new.name
+            WHERE rowid IN (SELECT id FROM contacts WHERE company_id = new.id);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER contacts_fts_after_company_delete AFTER DELETE ON companies BEGIN
+            UPDATE contacts_fts SET company_name = ''
+            WHERE rowid IN (SELECT id FROM contacts WHERE company_id = old.id);
+        END
+        """
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS contacts_fts_after_company_delete")
+    op.execute("DROP TRIGGER IF EXISTS contacts_fts_after_company_rename")
+    op.execute("DROP TRIGGER IF EXISTS contacts_fts_after_delete")
+    op.execute("DROP TRIGGER IF EXISTS contacts_fts_after_update")
+    op.execute("DROP TRIGGER IF EXISTS contacts_fts_after_insert")
+    op.execute("DROP TABLE IF EXISTS contacts_fts")
@@ -0,0 +1,55 @@
+"""Add companies.name_normalized lookup column and index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(name: str) -> str:
+    # Frozen copy of app.models.company.normalize_company_name
+    return " ".join(name.split()).lower()
+
+
+def upgrade() -> None:
+    # ADD COLUMN with a default keeps the table in place (a batch rebuild would drop the FTS triggers)
+    op.add_column(
+        "companies",
+        sa.Column("name_normalized", sa.String(length=255), nullable=False, server_default=""),
+    )
+
+    bind = op.get_bind()
+    companies = sa.table(
+        "companies",
+        sa.column("id", sa.Integer()),
+        sa.column("name", sa.String()),
+        sa.column("name_normalized", sa.String()),
+    )
+    rows = bind.execute(sa.select(companies.c.id, companies.c.name)).all()
+    if rows:
+        bind.execute(
+            companies.update()
+            .where(companies.c.id == sa.bindparam("company_id"))
+            .values(name_normalized=sa.bindparam("normalized")),
+            [{"company_id": row.id, "normalized": _normalize(row.name)} for row in rows],
+        )
+
+    op.create_index(
+        op.f("ix_companies_name_normalized"), "companies", ["name_normalized"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_companies_name_normalized"), table_name="companies")
+    op.drop_column("companies", "name_normalized")
@@ -0,0 +1,50 @@
+"""Make companies.name_normalized unique (merging duplicate companies first)
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Companies that differ only by case/whitespace collapse into the oldest one (lowest id):
+    # repoint their contacts, then delete the duplicates.
+    duplicate_ids = (
+        "SELECT id FROM companies "
+        "WHERE id NOT IN (SELECT min(id) FROM companies GROUP BY name_normalized)"
+    )
+    op.execute(
+        f"""
+        UPDATE contacts
+        SET company_id = (
+            SELECT min(keeper.id)
+            FROM companies AS duplicate
+            JOIN companies AS keeper ON keeper.name_normalized = duplicate.name_normalized
+            WHERE duplicate.id = contacts.company_id
+        )
+        WHERE company_id IN ({duplicate_ids})
+        """
+    )
+    op.execute(f"DELETE FROM companies WHERE id IN ({duplicate_ids})")
+    op.drop_index(op.f("ix_companies_name_normalized"), table_name="companies")
+    op.create_index(
+        op.f("ix_companies_name_normalized"), "companies", ["name_normalized"], unique=True
+    )
+
+
+def downgrade() -> None:
+    # Merged duplicates are not restored
+    op.drop_index(op.f("ix_companies_name_normalized"), table_name="companies")
+    op.create_index(
+        op.f("ix_companies_name_normalized"), "companies", ["name_normalized"], unique=False
+    )
@@ -0,0 +1,42 @@
+"""Add composite indexes for the contacts list and contact timeline ORDER BY paths
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Contacts list: ORDER BY updated_at DESC, id DESC (keyset pagination)
+    op.create_index("ix_contacts_updated_at_id", "contacts", ["updated_at", "id"], unique=False)
+    # Contact page: notes/activities of one contact in date order. The composite indexes also
+    # serve plain contact_id lookups (FK cascades), so the single-column ones are dropped.
+    op.create_index(
+        "ix_notes_contact_id_created_at", "notes", ["contact_id", "created_at"], unique=False
+    )
+    op.drop_index(op.f("ix_notes_contact_id"), table_name="notes")
+    op.create_index(
+        "ix_activities_contact_id_activity_date",
+        "activities",
+        ["contact_id", "activity_date"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_activities_contact_id"), table_name="activities")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_activities_contact_id"), "activities", ["contact_id"], unique=False)
+    op.drop_index("ix_activities_contact_id_activity_date", table_name="activities")
+    op.create_index(op.f("ix_notes_contact_id"), "notes", ["contact_id"], unique=False)
+    op.drop_index("ix_notes_contact_id_created_at", table_name="notes")
+    op.drop_index("ix_contacts_updated_at_id", table_name="contacts")
@@ -0,0 +1,35 @@
+"""Enable incremental auto-vacuum so maintenance can return free pages to the filesystem
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _set_auto_vacuum(mode: str) -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    # auto_vacuum is stored in the file header; changing it between NONE and INCREMENTAL only
+    # takes effect after a full VACUUM, which cannot run inside a transaction. The VACUUM
+    # rewrites the whole file, so this revision takes a while on a large database.
+    with op.get_context().autocommit_block():
+        op.execute(f"PRAGMA auto_vacuum = {mode}")
+        op.execute("VACUUM")
+
+
+def upgrade() -> None:
+    _set_auto_vacuum("INCREMENTAL")
+
+
+def downgrade() -> None:
+    _set_auto_vacuum("NONE")
@@ -0,0 +1,134 @@
+"""Add companies.contact_count and companies.last_activity_at, maintained by triggers
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Latest activity of any contact currently linked to the company `{company}`
+_LAST_ACTIVITY = """(
+    SELECT max(a.activity_date) FROM contacts c JOIN activities a ON a.contact_id = c.id
+    WHERE c.company_id = {company}{exclude}
+)"""
+
+# Company of the contact `{contact}` (NULL when the contact has none or is already deleted)
+_COMPANY_OF = "(SELECT company_id FROM contacts WHERE id = {contact})"
+
+# Triggers keep the columns exact for every write path (ORM, bulk import, FK cascades).
+# last_activity_at only ever needs the recomputation (_LAST_ACTIVITY) when the activity or
+# contact being removed held the company's latest date; otherwise it is a comparison.
+_TRIGGERS = {
+    "company_stats_after_contact_insert": """
+        AFTER INSERT ON contacts WHEN new.company_id IS NOT NULL BEGIN
+            UPDATE companies SET contact_count = contact_count + 1 WHERE id = new.company_id;
+        END
+    """,
+    # BEFORE: the contact's activities are still there to tell whether it held the latest
+    # date (ON DELETE CASCADE removes them before AFTER triggers run).
+    "company_stats_before_contact_delete": f"""
+        BEFORE DELETE ON contacts WHEN old.company_id IS NOT NULL BEGIN
+            UPDATE companies SET
+                contact_count = contact_count - 1,
+                last_activity_at = CASE
+                    WHEN EXISTS (
+                        SELECT 1 FROM activities
+                        WHERE contact_id = old.id AND activity_date >= companies.last_activity_at
+                    )
+                    THEN {_LAST_ACTIVITY.format(company="old.company_id", exclude=" AND c.id != old.id")}
+                    ELSE last_activity_at
+                END
+            WHERE id = old.company_id;
+        END
+    """,
+    "company_stats_after_contact_company_change": f"""
+        AFTER UPDATE OF company_id ON contacts
+        WHEN old.company_id IS NOT new.company_id BEGIN
+            UPDATE companies SET
+                contact_count = contact_count - 1,
+                last_activity_at = CASE
+                    WHEN EXISTS (
+                        SELECT 1 FROM activities
+                        WHERE contact_id = new.id AND activity_date >= companies.last_activity_at
+                    )
+                    THEN {_LAST_ACTIVITY.format(company="old.company_id", exclude="")}
+                    ELSE last_activity_at
+                END
+            WHERE id = old.company_id;
+            UPDATE companies SET
+                contact_count = contact_count + 1,
+                last_activity_at = (
+                    SELECT max(activity_date) FROM (
+                        SELECT companies.last_activity_at AS activity_date
+                        UNION ALL
+                        SELECT max(activity_date) FROM activities WHERE contact_id = new.id
+                    )
+                )
+            WHERE id = new.company_id;
+        END
+    """,
+    "company_stats_after_activity_insert": f"""
+        AFTER INSERT ON activities BEGIN
+            UPDATE companies SET last_activity_at = new.activity_date
+            WHERE id = {_COMPANY_OF.format(contact="new.contact_id")}
+              AND (last_activity_at IS NULL OR last_activity_at < new.activity_date);
+        END
+    """,
+    "company_stats_after_activity_delete": f"""
+        AFTER DELETE ON activities BEGIN
+            UPDATE companies SET
+                last_activity_at = {_LAST_ACTIVITY.format(company="companies.id", exclude="")}
+            WHERE id = {_COMPANY_OF.format(contact="old.contact_id")}
+              AND last_activity_at <= old.activity_date;
+        END
+    """,
+    "company_stats_after_activity_update": f"""
+        AFTER UPDATE OF contact_id, activity_date ON activities BEGIN
+            UPDATE companies SET
+                last_activity_at = {_LAST_ACTIVITY.format(company="companies.id", exclude="")}
+            WHERE id = {_COMPANY_OF.format(contact="old.contact_id")}
+              AND last_activity_at <= old.activity_date;
+            UPDATE companies SET last_activity_at = new.activity_date
+            WHERE id = {_COMPANY_OF.format(contact="new.contact_id")}
+              AND (last_activity_at IS NULL OR last_activity_at < new.activity_date);
+        END
+    """,
+}
+
+
+def upgrade() -> None:
+    op.add_column(
+        "companies",
+        sa.Column("contact_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("companies", sa.Column("last_activity_at", sa.DateTime(), nullable=True))
+    op.execute(
+        f"""
+        UPDATE companies SET
+            contact_count = (SELECT count(*) FROM contacts WHERE company_id = companies.id),
+            last_activity_at = {_LAST_ACTIVITY.format(company="companies.id", exclude="")}
+        """
+    )
+
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for name, body in _TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for name in _TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_column("companies", "last_activity_at")
+    op.drop_column("companies", "contact_count")
@@ -0,0 +1,52 @@
+"""Add trigger-maintained data versions of the main tables to cache_versions (HTTP ETags)
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("contacts", "companies", "notes", "activities")
+_EVENTS = ("insert", "update", "delete")
+
+_cache_versions = sa.table("cache_versions", sa.column("name", sa.String), sa.column("version", sa.Integer))
+
+
+def _trigger_name(table: str, event: str) -> str:
+    return f"data_version_after_{table}_{event}"
+
+
+def upgrade() -> None:
+    # "data:<table>" moves on every row written to the table, whatever writes it (routes, bulk
+    # import, FK cascades, the company stats triggers of 011)
+    op.bulk_insert(_cache_versions, [{"name": f"data:{table}", "version": 0} for table in _TABLES])
+
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table in _TABLES:
+        for event in _EVENTS:
+            op.execute(
+                f"""
+                CREATE TRIGGER {_trigger_name(table, event)} AFTER {event.upper()} ON {table} BEGIN
+                    UPDATE cache_versions SET version = version + 1 WHERE name = 'data:{table}';
+                END
+                """
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for table in _TABLES:
+            for event in _EVENTS:
+                op.execute(f"DROP TRIGGER IF EXISTS {_trigger_name(table, event)}")
+    op.execute("DELETE FROM cache_versions WHERE name LIKE 'data:%'")
@@ -0,0 +1,179 @@
+"""Command-line entry point for maintenance tasks: `python -m app.cli <command> ...`."""
+
+import argparse
+import json
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.core.company_stats import rebuild_company_stats
+from app.core.config import CONTACTS_PAGE_SIZE, IMPORT_BATCH_SIZE, TIMELINE_PAGE_SIZE
+from app.core.contact_import import (
+    IMPORT_FORMATS,
+    ImportFormatError,
+    detect_format,
+    import_contacts,
+    iter_records,
+)
+from app.core.contact_queries import (
+    contacts_page_statement,
+    encode_cursor,
+    encode_timeline_cursor,
+    load_contact_detail,
+    load_timeline_page,
+)
+from app.db.maintenance import default_jobs, execute_job
+from app.db.query_plans import capture_statements, explain_query_plan, query_plan_problems
+from app.db.session import SessionLocal, engine
+from app.models import Activity, Contact, Note
+
+
+def _import_contacts(args: argparse.Namespace) -> int:
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        print("Cannot infer the format from the file name; pass --format", file=sys.stderr)
+        return 2
+    with open(args.path, encoding="utf-8-sig", newline="") as stream:
+        try:
+            report = import_contacts(SessionLocal, iter_records(stream, fmt), args.batch_size)
+        except ImportFormatError as e:
+            print(str(e), file=sys.stderr)
+            return 2
+    print(json.dumps(report.as_dict(), indent=2))
+    return 0 if report.error_count == 0 else 1
+
+
+# Cursors past every row, so the "next page" plans include the keyset bound
+_BROWSE_CURSOR = encode_cursor("9999-12-31 23:59:59", 2**31)
+_TIMELINE_CURSOR = encode_timeline_cursor("9999-12-31 23:59:59", 2**31, "note")
+
+# The statements behind the contacts list and contact page, by name. Contact page scenarios
+# read the throwaway contact of `query_plan_session` from db.info["probe_contact_id"]. Searches
+# are not here: they are ordered by FTS5 rank, which always needs a sort.
+QUERY_PLAN_SCENARIOS: dict[str, Callable[[Session], object]] = {
+    "contacts list": lambda db: db.execute(
+        contacts_page_statement(db, "", False, False, "", CONTACTS_PAGE_SIZE + 1)
+    ).all(),
+    "contacts list, has_email/has_phone": lambda db: db.execute(
+        contacts_page_statement(db, "", True, True, "", CONTACTS_PAGE_SIZE + 1)
+    ).all(),
+    "contacts list, next page": lambda db: db.execute(
+        contacts_page_statement(db, "", False, False, _BROWSE_CURSOR, CONTACTS_PAGE_SIZE + 1)
+    ).all(),
+    "contact page": lambda db: load_contact_detail(db, db.info["probe_contact_id"]),
+    "contact timeline": lambda db: load_timeline_page(
+        db, db.info["probe_contact_id"], "", "", TIMELINE_PAGE_SIZE
+    ),
+    "contact timeline, next page": lambda db: load_timeline_page(
+        db, db.info["probe_contact_id"], "", _TIMELINE_CURSOR, TIMELINE_PAGE_SIZE
+    ),
+    "contact timeline, one activity type": lambda db: load_timeline_page(
+        db, db.info["probe_contact_id"], "call", _TIMELINE_CURSOR, TIMELINE_PAGE_SIZE
+    ),
+}
+
+
+@contextmanager
+def query_plan_session() -> Iterator[Session]:
+    """A writer session holding a throwaway contact with a note and an activity (so the contact
+    page loads execute), rolled back on exit: safe against any database, even an empty one."""
+    with SessionLocal() as db:
+        probe = Contact(full_name="query plan probe")
+        probe.notes.append(Note(content="query plan probe"))
+        probe.activities.append(
+            Activity(type="call", description="query plan probe", activity_date=datetime.utcnow())
+        )
+        db.add(probe)
+        db.flush()
+        db.info["probe_contact_id"] = probe.id
+        db.expunge_all()
+        try:
+            yield db
+        finally:
+            db.rollback()
+
+
+def explain_scenario(db: Session, run: Callable[[Session], object]) -> list[tuple[str, list[str]]]:
+    """(statement, query plan) for each statement `run(db)` executes."""
+    with capture_statements(db.get_bind()) as statements:
+        run(db)
+    return [
+        (statement, explain_query_plan(db.connection(), statement, parameters))
+        for statement, parameters in statements
+    ]
+
+
+def _check_query_plans(args: argparse.Namespace) -> int:
+    """Explain the statements of QUERY_PLAN_SCENARIOS; fail on full scans and temp B-tree sorts."""
+    failed = False
+    with query_plan_session() as db:
+        for name, run in QUERY_PLAN_SCENARIOS.items():
+            print(f"== {name}")
+            for statement, plan in explain_scenario(db, run):
+                problems = query_plan_problems(plan)
+                failed = failed or bool(problems)
+                print(" ".join(statement.split()))
+                for step in plan:
+                    print(f"  {'!! ' if step in problems else ''}{step}")
+    return 1 if failed else 0
+
+
+def _run_maintenance(args: argparse.Namespace) -> int:
+    """Run the background maintenance jobs once, now, regardless of traffic."""
+    jobs = [job for job in default_jobs() if not args.job or job.name in args.job]
+    print(json.dumps({job.name: execute_job(engine, job) for job in jobs}, indent=2))
+    return 0
+
+
+def _rebuild_company_stats(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        corrected = rebuild_company_stats(db)
+        db.commit()
+    print(json.dumps({"companies_corrected": corrected}))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-contacts", help="Bulk import contacts from a CSV or JSONL file"
+    )
+    import_parser.add_argument("path", help="CSV (with header) or JSONL file")
+    import_parser.add_argument("--format", choices=IMPORT_FORMATS, help="Default: from file extension")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    import_parser.set_defaults(handler=_import_contacts)
+
+    plans_parser = commands.add_parser(
+        "check-query-plans",
+        help="Fail if the contacts list or contact page queries scan a table or sort in a temp B-tree",
+    )
+    plans_parser.set_defaults(handler=_check_query_plans)
+
+    maintenance_parser = commands.add_parser(
+        "maintenance", help="Checkpoint the WAL, refresh statistics and vacuum free pages now"
+    )
+    maintenance_parser.add_argument(
+        "--job",
+        action="append",
+        choices=[job.name for job in default_jobs()],
+        help="Job to run, repeatable. Default: all",
+    )
+    maintenance_parser.set_defaults(handler=_run_maintenance)
+
+    stats_parser = commands.add_parser(
+        "rebuild-company-stats",
+        help="Recompute companies.contact_count and last_activity_at from contacts and activities",
+    )
+    stats_parser.set_defaults(handler=_rebuild_company_stats)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""In-process cache of company picker lookups: (id, name) tuples per typeahead prefix.
+
+Every read checks the "companies" row of cache_versions (a primary-key lookup) and drops the
+cached lookups when the version moved, so a write committed by any worker invalidates every
+worker's copy. Code that creates, renames or deletes companies calls
+`bump_company_directory_version` inside its own transaction.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models import CacheVersion, Company
+from app.models.company import normalize_company_name
+
+COMPANY_DIRECTORY_CACHE = "companies"
+
+# Upper bound for a prefix range scan: sorts after any continuation of the prefix
+_PREFIX_END = "\U0010ffff"
+
+
+class CompanyOption(NamedTuple):
+    """Lightweight company row for pickers; templates use `.id` and `.name` like a Company."""
+
+    id: int
+    name: str
+
+
+class CompanyDirectory:
+    """Version-checked LRU of prefix searches over companies.name_normalized."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._version: int | None = None
+        self._searches: OrderedDict[tuple[str, int], tuple[CompanyOption, ...]] = OrderedDict()
+
+    def search(self, db: Session, q: str, limit: int) -> tuple[CompanyOption, ...]:
+        """Top `limit` companies whose normalized name starts with the normalized `q`, by name.
+
+        The version is read before the rows, in the same transaction, so a concurrent write can
+        only make a cached result newer than its version (causing one extra reload), never older.
+        """
+        prefix = normalize_company_name(q)
+        key = (prefix, limit)
+        version = db.execute(
+            select(CacheVersion.version).where(CacheVersion.name == COMPANY_DIRECTORY_CACHE)
+        ).scalar_one_or_none()
+        with self._lock:
+            if version is None or version != self._version:
+                self._searches.clear()
+            elif key in self._searches:
+                self._searches.move_to_end(key)
+                return self._searches[key]
+
+        stmt = select(Company.id, Company.name)
+        if prefix:
+            stmt = stmt.where(
+                Company.name_normalized >= prefix,
+                Company.name_normalized < prefix + _PREFIX_END,
+            )
+        rows = db.execute(stmt.order_by(Company.name_normalized.asc()).limit(limit)).all()
+        companies = tuple(CompanyOption(company_id, name) for company_id, name in rows)
+        with self._lock:
+            self._version = version
+            self._searches[key] = companies
+            if len(self._searches) > self._max_entries:
+                self._searches.popitem(last=False)
+        return companies
+
+
+company_directory = CompanyDirectory()
+
+
+def bump_company_directory_version(db: Session) -> None:
+    """Invalidate every worker's company directory once the caller's transaction commits."""
+    db.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == COMPANY_DIRECTORY_CACHE)
+        .values(version=CacheVersion.version + 1)
+    )
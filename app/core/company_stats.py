@@ -0,0 +1,43 @@
+"""Reconciliation of the denormalized company columns contact_count and last_activity_at.
+
+Database triggers (migration 011) keep both exact on every write; `rebuild_company_stats`
+recomputes them from contacts and activities for databases written with the triggers missing
+(restored backups, writes made with other tools) and reports how many companies had drifted.
+"""
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Activity, Company, Contact
+
+
+def rebuild_company_stats(db: Session) -> int:
+    """Recompute contact_count and last_activity_at; returns the number of companies corrected.
+
+    Only drifted rows are written, and updated_at is left alone (the stats are not an edit).
+    """
+    contact_count = (
+        select(func.count()).where(Contact.company_id == Company.id).scalar_subquery()
+    )
+    last_activity_at = (
+        select(func.max(Activity.activity_date))
+        .join(Contact, Contact.id == Activity.contact_id)
+        .where(Contact.company_id == Company.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Company)
+        .where(
+            or_(
+                Company.contact_count != contact_count,
+                Company.last_activity_at.is_distinct_from(last_activity_at),
+            )
+        )
+        .values(
+            contact_count=contact_count,
+            last_activity_at=last_activity_at,
+            updated_at=Company.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -7,11 +7,126 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_int(name: str, default: int, minimum: int | None = None) -> int:
+    """Read an integer setting; raise ValueError naming the variable when invalid."""
+    raw = os.getenv(name, str(default)).strip()
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}, got {value}")
+    return value
+
+
+def _env_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    """Read a setting restricted to `choices` (case-insensitive); returns the upper-cased value."""
+    value = os.getenv(name, default).strip().upper()
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
+
 # Database: SQLite file created on first connection or when migrations run
 DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
+# Connection pools (SQLite file databases): one writer connection serializes writes in-process,
+# the read-only pool serves GET handlers in parallel (and may overflow by the same amount).
+DB_WRITE_POOL_SIZE: int = _env_int("DB_WRITE_POOL_SIZE", 1, minimum=1)
+DB_READ_POOL_SIZE: int = _env_int("DB_READ_POOL_SIZE", 8, minimum=1)
+# Seconds a request waits for a pooled connection before failing
+DB_POOL_TIMEOUT_SECONDS: int = _env_int("DB_POOL_TIMEOUT_SECONDS", 30, minimum=1)
+
+# Async read stack: serve the read-only pages from `async def` handlers on an aiosqlite engine
+# (needs a SQLite file database and the aiosqlite package). Writes stay on the sync writer.
+DB_ASYNC: bool = os.getenv("DB_ASYNC", "false").lower() in ("true", "1", "yes")
+
 # Debug mode
 DEBUG: bool = os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
 
 # Project root (for resolving paths relative to project)
 PROJECT_ROOT: Path = Path(__file__).resolve().parent.parent.parent
+
+# Jinja2 bytecode cache directory (compiled templates survive restarts); empty = a per-user
+# directory under the system temp dir. Templates are only re-checked for changes when DEBUG is on.
+TEMPLATE_BYTECODE_CACHE_DIR: str = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", "")
+
+# Request instrumentation: requests running more SQL statements than this are logged and
+# counted as likely N+1 query patterns
+N_PLUS_ONE_QUERY_THRESHOLD: int = _env_int("N_PLUS_ONE_QUERY_THRESHOLD", 20, minimum=1)
+
+# /health/ready: seconds a readiness report is reused before the database is checked again
+# (0 checks on every probe)
+HEALTH_READY_TTL_SECONDS: int = _env_int("HEALTH_READY_TTL_SECONDS", 2, minimum=0)
+
+# Background database maintenance (SQLite files): WAL checkpoint, ANALYZE, incremental vacuum.
+# Each job runs every *_INTERVAL_SECONDS, but is postponed while the app serves more than
+# MAINTENANCE_MAX_REQUESTS_PER_SECOND.
+MAINTENANCE_ENABLED: bool = os.getenv("MAINTENANCE_ENABLED", "true").lower() in ("true", "1", "yes")
+MAINTENANCE_CHECKPOINT_INTERVAL_SECONDS: int = _env_int(
+    "MAINTENANCE_CHECKPOINT_INTERVAL_SECONDS", 300, minimum=1
+)
+MAINTENANCE_OPTIMIZE_INTERVAL_SECONDS: int = _env_int(
+    "MAINTENANCE_OPTIMIZE_INTERVAL_SECONDS", 3600, minimum=1
+)
+MAINTENANCE_VACUUM_INTERVAL_SECONDS: int = _env_int(
+    "MAINTENANCE_VACUUM_INTERVAL_SECONDS", 3600, minimum=1
+)
+# The checkpoint job is PASSIVE; it also truncates the WAL file (waiting for readers) only
+# when it is larger than this and the passive checkpoint copied back every frame
+MAINTENANCE_WAL_TRUNCATE_BYTES: int = _env_int(
+    "MAINTENANCE_WAL_TRUNCATE_BYTES", 64 * 1024 * 1024, minimum=0
+)
+# Free pages returned to the filesystem per incremental vacuum run (0 = all of them)
+MAINTENANCE_VACUUM_PAGES: int = _env_int("MAINTENANCE_VACUUM_PAGES", 2000, minimum=0)
+MAINTENANCE_MAX_REQUESTS_PER_SECOND: int = _env_int(
+    "MAINTENANCE_MAX_REQUESTS_PER_SECOND", 20, minimum=0
+)
+
+# Contacts list: rows per keyset page (initial render and each infinite-scroll fetch)
+CONTACTS_PAGE_SIZE: int = _env_int("CONTACTS_PAGE_SIZE", 50, minimum=1)
+
+# Contact page: notes and activities per timeline page ("Load older" fetches the next one)
+TIMELINE_PAGE_SIZE: int = _env_int("TIMELINE_PAGE_SIZE", 25, minimum=1)
+
+# Streamed list pages (contacts, companies): rows fetched per cursor round trip while rendering
+LIST_FETCH_SIZE: int = _env_int("LIST_FETCH_SIZE", 200, minimum=1)
+
+# Rendered contact/company rows kept per worker, bounded by estimated bytes (0 disables)
+FRAGMENT_CACHE_MAX_BYTES: int = _env_int("FRAGMENT_CACHE_MAX_BYTES", 16 * 1024 * 1024, minimum=0)
+
+# Contacts search result cache: seconds an entry lives, searches kept per worker (0 disables),
+# and the largest match list kept (broader searches are not cached)
+SEARCH_CACHE_TTL_SECONDS: int = _env_int("SEARCH_CACHE_TTL_SECONDS", 30, minimum=1)
+SEARCH_CACHE_MAX_ENTRIES: int = _env_int("SEARCH_CACHE_MAX_ENTRIES", 256, minimum=0)
+SEARCH_CACHE_MAX_IDS: int = _env_int("SEARCH_CACHE_MAX_IDS", 2000, minimum=1)
+
+# Contacts list facets: companies shown, and filter keys cached per worker (0 disables)
+FACETS_TOP_COMPANIES: int = _env_int("FACETS_TOP_COMPANIES", 5, minimum=0)
+FACET_CACHE_MAX_ENTRIES: int = _env_int("FACET_CACHE_MAX_ENTRIES", 256, minimum=0)
+
+# Company typeahead: maximum matches returned by /companies/search
+COMPANY_SEARCH_LIMIT: int = _env_int("COMPANY_SEARCH_LIMIT", 10, minimum=1)
+
+# Bulk contact import: rows per INSERT batch / transaction
+IMPORT_BATCH_SIZE: int = _env_int("IMPORT_BATCH_SIZE", 1000, minimum=1)
+
+# Streaming exports: rows fetched per cursor round trip (and written per response chunk)
+EXPORT_CHUNK_SIZE: int = _env_int("EXPORT_CHUNK_SIZE", 1000, minimum=1)
+
+# SQLite engine profile: PRAGMAs applied to every new connection (ignored for other databases).
+# WAL lets readers proceed while a write commits; with WAL, NORMAL sync only risks the latest commits on power loss.
+SQLITE_JOURNAL_MODE: str = _env_choice(
+    "SQLITE_JOURNAL_MODE", "WAL", ("WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF")
+)
+SQLITE_SYNCHRONOUS: str = _env_choice(
+    "SQLITE_SYNCHRONOUS", "NORMAL", ("OFF", "NORMAL", "FULL", "EXTRA")
+)
+SQLITE_TEMP_STORE: str = _env_choice("SQLITE_TEMP_STORE", "MEMORY", ("DEFAULT", "FILE", "MEMORY"))
+# Bytes of the database file to memory-map (0 disables mmap)
+SQLITE_MMAP_SIZE: int = _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024, minimum=0)
+# Page cache per connection: positive = pages, negative = KiB (SQLite convention)
+SQLITE_CACHE_SIZE: int = _env_int("SQLITE_CACHE_SIZE", -64 * 1024)
+# Milliseconds a connection waits on a locked database before raising "database is locked"
+SQLITE_BUSY_TIMEOUT_MS: int = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000, minimum=0)
@@ -0,0 +1,162 @@
+"""Bulk operations on contacts: delete, move to a company, link legacy company text.
+
+An operation targets explicit contact ids or every contact matching the list filters (q,
+has_email, has_phone through `contact_filter_conditions`) and runs as set-based UPDATE / DELETE
+statements in the caller's transaction, so its cost does not grow by a round trip per contact.
+Triggers keep the search index, company stats and data versions in step with those statements
+(migrations 005, 011 and 012), and notes and activities go with their contact through ON DELETE
+CASCADE. Id and name lists are bound in chunks to stay below SQLite's bound-parameter limit.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TypeVar
+
+from sqlalchemy import Delete, Update, case, delete, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.contact_filters import contact_filter_conditions
+from app.core.contact_import import resolve_companies
+from app.core.contact_queries import SQLITE_MAX_INTEGER
+from app.models import Company, Contact
+from app.models.company import normalize_company_name
+
+BULK_ACTIONS = ("delete", "reassign", "link_companies")
+
+# Contact ids or company names bound per statement
+_CHUNK_SIZE = 500
+
+T = TypeVar("T")
+
+
+def _chunks(values: Sequence[T]) -> Iterator[Sequence[T]]:
+    for start in range(0, len(values), _CHUNK_SIZE):
+        yield values[start : start + _CHUNK_SIZE]
+
+
+def parse_contact_ids(values: Iterable[str]) -> tuple[int, ...]:
+    """Distinct contact ids from form values, each a single id or comma-separated ids.
+    Raises ValueError on anything that is not an id (SQLite could not bind ids past its
+    INTEGER range)."""
+    ids: set[int] = set()
+    for value in values:
+        for part in value.split(","):
+            if part.strip():
+                contact_id = int(part)
+                if not 1 <= contact_id <= SQLITE_MAX_INTEGER:
+                    raise ValueError(f"Invalid contact id: {part}")
+                ids.add(contact_id)
+    return tuple(sorted(ids))
+
+
+@dataclass(frozen=True)
+class BulkTarget:
+    """The contacts an operation applies to: `ids` when given, else those matching the filters."""
+
+    ids: tuple[int, ...] | None = None
+    q: str = ""
+    has_email: bool = False
+    has_phone: bool = False
+
+    def condition_sets(self, db: Session) -> list[list[ColumnElement[bool]]]:
+        """WHERE conditions per statement: the filters, or one chunk of ids each."""
+        if self.ids is None:
+            return [contact_filter_conditions(db, self.q, self.has_email, self.has_phone)]
+        return [[Contact.id.in_(chunk)] for chunk in _chunks(self.ids)]
+
+
+@dataclass(frozen=True)
+class BulkResult:
+    action: str
+    affected: int  # contacts deleted, moved or linked
+    companies_created: int = 0
+
+
+def _rowcount(db: Session, stmt: Delete | Update) -> int:
+    # Nothing in the session is refreshed from these statements: the caller commits and re-reads
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+def delete_contacts(db: Session, target: BulkTarget) -> BulkResult:
+    deleted = sum(
+        _rowcount(db, delete(Contact).where(*conditions))
+        for conditions in target.condition_sets(db)
+    )
+    return BulkResult("delete", deleted)
+
+
+def reassign_company(
+    db: Session, target: BulkTarget, company: Company, company_created: bool = False
+) -> BulkResult:
+    """Link the target contacts to `company` (its name replaces their company text, as in the
+    contact form). Contacts already linked to it are left alone. `company_created` says the
+    caller has just created `company` for this, so the result counts it."""
+    values = {"company_id": company.id, "company": company.name, "updated_at": datetime.utcnow()}
+    moved = sum(
+        _rowcount(
+            db,
+            update(Contact)
+            .where(*conditions, Contact.company_id.is_distinct_from(company.id))
+            .values(**values),
+        )
+        for conditions in target.condition_sets(db)
+    )
+    return BulkResult("reassign", moved, int(company_created))
+
+
+def link_legacy_companies(db: Session, target: BulkTarget) -> BulkResult:
+    """Link target contacts that only have company text to the company of that (normalized)
+    name, creating missing companies as the importer does; their text becomes its name.
+
+    One UPDATE per chunk of distinct names sets each contact's company with a CASE on its text.
+    """
+    condition_sets = [
+        [
+            *conditions,
+            Contact.company_id.is_(None),
+            Contact.company.is_not(None),
+            Contact.company != "",
+        ]
+        for conditions in target.condition_sets(db)
+    ]
+    # Sorted by the tidied text, so of several spellings of a new company the capitalized wins
+    names = sorted(
+        {
+            name
+            for conditions in condition_sets
+            for name in db.scalars(select(Contact.company).where(*conditions).distinct())
+        },
+        key=lambda name: " ".join(name.split()),
+    )
+    now = datetime.utcnow()
+    linked = created = 0
+    for chunk in _chunks(names):
+        # New companies are named after the text with its whitespace tidied
+        companies, chunk_created = resolve_companies(db, (" ".join(name.split()) for name in chunk))
+        created += chunk_created
+        company_of = {
+            name: companies[normalize_company_name(name)]
+            for name in chunk
+            if normalize_company_name(name) in companies
+        }
+        if not company_of:
+            continue
+        values = {
+            "company_id": case(
+                {name: company.id for name, company in company_of.items()}, value=Contact.company
+            ),
+            "company": case(
+                {name: company.name for name, company in company_of.items()}, value=Contact.company
+            ),
+            "updated_at": now,
+        }
+        for conditions in condition_sets:
+            linked += _rowcount(
+                db,
+                update(Contact)
+                .where(*conditions, Contact.company.in_(list(company_of)))
+                .values(**values),
+            )
+    return BulkResult("link_companies", linked, created)
@@ -0,0 +1,137 @@
+"""Facet counts for the contacts list filters: total, with email, with phone, top companies.
+
+One aggregate over the contacts matching the search (`contact_filter_conditions` with `q`
+only) grouped by company, with conditional SUMs for "has email", "has phone" and both. From
+those per-company sums the facets of all four has_email/has_phone combinations follow without
+another scan, so one computation fills the cache for each of them. Entries are keyed by
+(q, has_email, has_phone) and stay valid until the contacts or companies data version moves
+(see app.core.http_cache).
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import FACET_CACHE_MAX_ENTRIES, FACETS_TOP_COMPANIES
+from app.core.contact_filters import contact_filter_conditions, contact_flag_conditions
+from app.core.http_cache import data_versions
+from app.models import Company, Contact
+
+# (q, has_email, has_phone)
+_FacetKey = tuple[str, bool, bool]
+
+# Tables the facets are computed from
+_FACET_TABLES = ("contacts", "companies")
+
+
+@dataclass(frozen=True)
+class CompanyFacet:
+    company_id: int
+    name: str
+    count: int
+
+
+@dataclass(frozen=True)
+class ContactFacets:
+    """Counts for the contacts matching a filter. with_email / with_phone also honour the
+    other flag, so each is the total that ticking its checkbox would give."""
+
+    total: int
+    with_email: int
+    with_phone: int
+    companies: tuple[CompanyFacet, ...]  # most contacts first
+
+
+def _count_where(conditions: list[ColumnElement[bool]]) -> ColumnElement[int]:
+    return func.sum(case((and_(*conditions), 1), else_=0))
+
+
+def compute_contact_facets(
+    db: Session, q: str, top_companies: int = FACETS_TOP_COMPANIES
+) -> dict[tuple[bool, bool], ContactFacets]:
+    """Facets of the contacts matching `q` for every (has_email, has_phone), in one scan."""
+    email = contact_flag_conditions(True, False)
+    phone = contact_flag_conditions(False, True)
+    groups = db.execute(
+        select(
+            Contact.company_id,
+            func.count(),
+            _count_where(email),
+            _count_where(phone),
+            _count_where(email + phone),
+        )
+        .where(*contact_filter_conditions(db, q, False, False))
+        .group_by(Contact.company_id)
+    ).all()
+
+    # Sums per group: [all, with email, with phone, with both], indexed by (has_email, has_phone)
+    column = {(False, False): 1, (True, False): 2, (False, True): 3, (True, True): 4}
+    top: dict[tuple[bool, bool], list[tuple[int, int]]] = {}
+    for flags, index in column.items():
+        counts = [
+            (group[index], group[0]) for group in groups if group[0] is not None and group[index]
+        ]
+        top[flags] = sorted(counts, key=lambda count: (-count[0], count[1]))[:top_companies]
+
+    company_ids = {company_id for counts in top.values() for _, company_id in counts}
+    names: dict[int, str] = {}
+    if company_ids:
+        names.update(
+            db.execute(select(Company.id, Company.name).where(Company.id.in_(company_ids))).all()
+        )
+
+    def total(index: int) -> int:
+        return sum(group[index] or 0 for group in groups)
+
+    return {
+        (has_email, has_phone): ContactFacets(
+            total=total(column[(has_email, has_phone)]),
+            with_email=total(column[(True, has_phone)]),
+            with_phone=total(column[(has_email, True)]),
+            companies=tuple(
+                CompanyFacet(company_id, names[company_id], count)
+                for count, company_id in top[(has_email, has_phone)]
+                if company_id in names
+            ),
+        )
+        for has_email, has_phone in column
+    }
+
+
+class FacetCache:
+    """LRU of facets per filter key, valid while the contacts/companies data versions hold."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_FacetKey, tuple[tuple[int, ...], ContactFacets]] = OrderedDict()
+
+    def get(self, db: Session, q: str, has_email: bool, has_phone: bool) -> ContactFacets:
+        q = q.strip()
+        # Read before the counts, in the same transaction (see app.core.http_cache)
+        versions = data_versions(db, _FACET_TABLES) if self.max_entries > 0 else None
+        if versions is None:
+            return compute_contact_facets(db, q)[(has_email, has_phone)]
+        version = tuple(versions[table] for table in _FACET_TABLES)
+        key = (q, has_email, has_phone)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        facets = compute_contact_facets(db, q)
+        with self._lock:
+            for (email_flag, phone_flag), flag_facets in facets.items():
+                self._entries[(q, email_flag, phone_flag)] = (version, flag_facets)
+                self._entries.move_to_end((q, email_flag, phone_flag))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return facets[(has_email, has_phone)]
+
+
+facet_cache = FacetCache(FACET_CACHE_MAX_ENTRIES)
@@ -0,0 +1,67 @@
+"""WHERE conditions for the contacts list filters (q, has_email, has_phone).
+
+Shared by every view over "the filtered contacts" (list page, exports, ...), so they always
+agree on which contacts match. Search uses the FTS5 index when the database has it and falls
+back to ILIKE otherwise.
+"""
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.fts import (
+    build_prefix_query,
+    contacts_fts,
+    contacts_fts_available,
+    contacts_fts_match,
+)
+from app.models import Contact
+
+
+def contact_fts_query(db: Session, q: str) -> str | None:
+    """FTS5 MATCH query for `q`, or None when search should use ILIKE (or there is no search)."""
+    q = q.strip()
+    if not q or not contacts_fts_available(db):
+        return None
+    return build_prefix_query(q)
+
+
+def contact_ilike_condition(q: str) -> ColumnElement[bool]:
+    search_value = f"%{q.strip()}%"
+    return or_(
+        Contact.full_name.ilike(search_value),
+        Contact.email.ilike(search_value),
+        Contact.company.ilike(search_value),
+    )
+
+
+def contact_flag_conditions(has_email: bool, has_phone: bool) -> list[ColumnElement[bool]]:
+    conditions: list[ColumnElement[bool]] = []
+    if has_email:
+        conditions.extend([Contact.email.is_not(None), Contact.email != ""])
+    if has_phone:
+        conditions.extend([Contact.phone.is_not(None), Contact.phone != ""])
+    return conditions
+
+
+def contact_filter_conditions(
+    db: Session,
+    q: str,
+    has_email: bool,
+    has_phone: bool,
+) -> list[ColumnElement[bool]]:
+    """All filter conditions on Contact; the search is an `id IN (FTS match)` semi-join.
+
+    Views that rank by relevance join contacts_fts themselves (see list_contacts) and use only
+    `contact_flag_conditions`.
+    """
+    conditions = contact_flag_conditions(has_email, has_phone)
+    if q.strip():
+        fts_query = contact_fts_query(db, q)
+        if fts_query is not None:
+            conditions.append(
+                Contact.id.in_(select(contacts_fts.c.rowid).where(contacts_fts_match(fts_query)))
+            )
+        else:
+            conditions.append(contact_ilike_condition(q))
+    return conditions
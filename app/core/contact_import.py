@@ -0,0 +1,221 @@
+"""Streaming bulk import of contacts from CSV or JSONL.
+
+Records are parsed incrementally, validated with ContactFormSchema and written in batches:
+one company lookup/insert round trip per batch (instead of one per row) and one executemany
+INSERT of contacts, each batch in its own short transaction. A session is opened per batch, so
+a long import returns the writer connection to the pool between batches.
+"""
+
+import csv
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.company_directory import bump_company_directory_version
+from app.db.upsert import insert_ignoring_conflicts
+from app.models import Company, Contact
+from app.models.company import normalize_company_name
+from app.schemas.contact import ContactFormSchema
+
+IMPORT_FORMATS = ("csv", "jsonl")
+CONTACT_FIELDS = ("full_name", "email", "phone", "company")
+# Row errors kept in the report; further failures are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormatError(ValueError):
+    """The input cannot be parsed as the requested format at all (e.g. CSV without a header)."""
+
+
+@dataclass
+class ImportRowError:
+    """A rejected input row: 1-based line number in the source and validation messages."""
+
+    line: int
+    errors: list[str]
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import run."""
+
+    rows_read: int = 0
+    rows_imported: int = 0
+    error_count: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    companies_created: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def add_error(self, line: int, errors: list[str]) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(line=line, errors=errors))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rows_read": self.rows_read,
+            "rows_imported": self.rows_imported,
+            "error_count": self.error_count,
+            "errors": [{"line": e.line, "errors": e.errors} for e in self.errors],
+            "companies_created": self.companies_created,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+# A parsed record: (line number, field dict) or (line number, parse error message)
+ParsedRecord = tuple[int, dict[str, Any] | str]
+
+
+def detect_format(filename: str | None) -> str | None:
+    """Import format from a file name extension (.csv, .jsonl, .ndjson), or None if unknown."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[ParsedRecord]:
+    """Yield records one at a time from a text stream, without reading it whole.
+
+    Raises ImportFormatError when the input cannot be parsed as `fmt` (a bad CSV header, or CSV
+    the reader gives up on partway). Rows already yielded may have been imported by then.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        try:
+            if reader.fieldnames is None:
+                raise ImportFormatError("CSV input is empty")
+            if "full_name" not in reader.fieldnames:
+                raise ImportFormatError("CSV header must include a full_name column")
+            for row in reader:
+                yield reader.line_num, row
+        except csv.Error as e:
+            # e.g. a field over csv.field_size_limit(): the rest of the file cannot be read.
+            # line_num counts the lines fully read, not the one the reader failed on.
+            raise ImportFormatError(f"Malformed CSV at line {reader.line_num + 1}: {e}") from e
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "Each JSONL line must be an object"
+                continue
+            yield line_number, record
+    else:
+        raise ImportFormatError(f"Unsupported import format: {fmt}")
+
+
+def _validate(record: dict[str, Any]) -> ContactFormSchema:
+    values = {}
+    for name in CONTACT_FIELDS:
+        value = record.get(name)
+        if value is not None and not isinstance(value, str):
+            value = str(value)
+        values[name] = value.strip() if value else None
+    values["full_name"] = values["full_name"] or ""
+    return ContactFormSchema(**values)
+
+
+def resolve_companies(db: Session, names: Iterable[str]) -> tuple[dict[str, Company], int]:
+    """Map normalized name -> Company for a batch, creating missing companies in one INSERT.
+
+    Returns (mapping, number of companies created).
+    """
+    display_by_key: dict[str, str] = {}
+    for name in names:
+        display_by_key.setdefault(normalize_company_name(name), name)
+    display_by_key.pop("", None)
+    if not display_by_key:
+        return {}, 0
+
+    def load(keys: Iterable[str]) -> dict[str, Company]:
+        rows = db.execute(select(Company).where(Company.name_normalized.in_(list(keys))))
+        return {company.name_normalized: company for company in rows.scalars()}
+
+    companies = load(display_by_key)
+    missing = [key for key in display_by_key if key not in companies]
+    created = 0
+    if missing:
+        created = insert_ignoring_conflicts(
+            db,
+            Company,
+            [{"name": display_by_key[key], "name_normalized": key} for key in missing],
+            index_elements=["name_normalized"],
+        )
+        if created:
+            bump_company_directory_version(db)
+        companies.update(load(missing))
+    return companies, created
+
+
+def _write_batch(
+    session_factory: Callable[[], Session],
+    batch: list[tuple[int, ContactFormSchema]],
+    report: ImportReport,
+) -> None:
+    with session_factory() as db:
+        companies, created = resolve_companies(
+            db, (data.company for _, data in batch if data.company)
+        )
+        rows = []
+        for _, data in batch:
+            company = companies.get(normalize_company_name(data.company or ""))
+            rows.append(
+                {
+                    "full_name": data.full_name,
+                    "email": data.email,
+                    "phone": data.phone,
+                    "company": company.name if company is not None else data.company,
+                    "company_id": company.id if company is not None else None,
+                }
+            )
+        db.execute(insert(Contact.__table__), rows)
+        db.commit()
+    report.rows_imported += len(rows)
+    report.companies_created += created
+
+
+def import_contacts(
+    session_factory: Callable[[], Session],
+    records: Iterable[ParsedRecord],
+    batch_size: int,
+) -> ImportReport:
+    """Validate and insert `records` in batches of `batch_size`; invalid rows are reported, not fatal."""
+    report = ImportReport()
+    started = time.perf_counter()
+    batch: list[tuple[int, ContactFormSchema]] = []
+    for line, record in records:
+        report.rows_read += 1
+        if isinstance(record, str):
+            report.add_error(line, [record])
+            continue
+        try:
+            batch.append((line, _validate(record)))
+        except ValidationError as e:
+            report.add_error(line, [err["msg"] for err in e.errors()])
+            continue
+        if len(batch) >= batch_size:
+            _write_batch(session_factory, batch, report)
+            batch = []
+    if batch:
+        _write_batch(session_factory, batch, report)
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
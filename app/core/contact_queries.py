@@ -0,0 +1,369 @@
+"""Queries behind the contacts list and contact page (details and notes/activities timeline).
+
+Kept out of the route module so `python -m app.cli check-query-plans` can explain exactly the
+statements the routes execute.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, NamedTuple, get_args
+from urllib.parse import urlencode
+
+from sqlalchemy import (
+    ColumnElement,
+    CompoundSelect,
+    Row,
+    Select,
+    String,
+    literal,
+    select,
+    tuple_,
+    type_coerce,
+    union_all,
+)
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.contact_filters import (
+    contact_flag_conditions,
+    contact_fts_query,
+    contact_ilike_condition,
+)
+from app.core.templates import LazyRows
+from app.db.fts import contacts_fts, contacts_fts_match
+from app.models import Activity, Contact, Note
+from app.schemas.activity import ActivityType
+
+# Raw stored updated_at value: keyset comparisons must use the same representation the
+# database orders by (SQLite keeps DateTime as text, with or without microseconds).
+_contact_sort_updated_at = type_coerce(Contact.updated_at, String)
+
+# A decoded contacts list cursor: (sort value, contact id)
+ContactsCursor = tuple[str | float, int]
+
+# SQLite's INTEGER range: binding a Python int outside it raises OverflowError
+SQLITE_MIN_INTEGER = -(2**63)
+SQLITE_MAX_INTEGER = 2**63 - 1
+
+
+class InvalidCursorError(ValueError):
+    """The cursor is malformed or belongs to a differently sorted list (search vs. browse)."""
+
+
+def _encode_json_cursor(values: list[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_json_cursor(cursor: str) -> Any:
+    """The JSON value in a cursor, or None when it is not valid base64 JSON."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def _is_sqlite_integer(value: Any) -> bool:
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and SQLITE_MIN_INTEGER <= value <= SQLITE_MAX_INTEGER
+    )
+
+
+def encode_cursor(sort_value: str | float, contact_id: int) -> str:
+    return _encode_json_cursor([sort_value, contact_id])
+
+
+def decode_cursor(cursor: str) -> ContactsCursor | None:
+    """Decode a contacts list cursor into (sort value, id). Returns None when malformed.
+
+    The sort value is the raw updated_at text, or the FTS rank when the list is a search.
+    """
+    try:
+        sort_value, contact_id = _decode_json_cursor(cursor)
+    except (ValueError, TypeError):
+        return None
+    if isinstance(sort_value, bool) or not isinstance(sort_value, (str, int, float)):
+        return None
+    if isinstance(sort_value, int) and not _is_sqlite_integer(sort_value):
+        return None
+    if not _is_sqlite_integer(contact_id):
+        return None
+    return sort_value, contact_id
+
+
+def decode_list_cursor(cursor: str, ranked: bool) -> ContactsCursor:
+    """Decode a contacts list cursor for a list ordered by FTS rank (`ranked`) or updated_at.
+
+    Raises InvalidCursorError when it is malformed or comes from the other kind of list.
+    """
+    position = decode_cursor(cursor)
+    if position is None or isinstance(position[0], str) == ranked:
+        raise InvalidCursorError(cursor)
+    return position
+
+
+def contacts_list_ranked(db: Session, q: str) -> bool:
+    """True when the list for `q` is a full-text search ordered by FTS5 rank."""
+    return contact_fts_query(db, q) is not None
+
+
+def _contacts_list_statement(
+    db: Session,
+    q: str,
+    has_email: bool,
+    has_phone: bool,
+    cursor: str,
+    entity: Any,
+) -> Select:
+    q = q.strip()
+    fts_query = contact_fts_query(db, q)
+
+    if fts_query is not None:
+        # Full-text search: best matches first (FTS5 rank ascending), keyset on (rank, id).
+        sort_column = contacts_fts.c.rank
+        stmt = (
+            select(entity, sort_column.label("sort_key"))
+            .join(contacts_fts, contacts_fts.c.rowid == Contact.id)
+            .where(contacts_fts_match(fts_query))
+        )
+        order_by = (sort_column.asc(), Contact.id.asc())
+    else:
+        sort_column = _contact_sort_updated_at
+        stmt = select(entity, sort_column.label("sort_key"))
+        order_by = (Contact.updated_at.desc(), Contact.id.desc())
+        if q:
+            stmt = stmt.where(contact_ilike_condition(q))
+    stmt = stmt.where(*contact_flag_conditions(has_email, has_phone))
+
+    cursor = cursor.strip()
+    if cursor:
+        position = decode_list_cursor(cursor, ranked=fts_query is not None)
+        if fts_query is not None:
+            stmt = stmt.where(tuple_(sort_column, Contact.id) > position)
+        else:
+            stmt = stmt.where(tuple_(sort_column, Contact.id) < position)
+
+    return stmt.order_by(*order_by)
+
+
+def contacts_page_statement(
+    db: Session,
+    q: str,
+    has_email: bool,
+    has_phone: bool,
+    cursor: str,
+    limit: int,
+) -> Select:
+    """One contacts list page as rows of (Contact, sort_key), with company_ref eager-loaded.
+
+    Browsing is ordered by (updated_at, id) descending, served by ix_contacts_updated_at_id;
+    a search is ordered by FTS5 rank. Raises InvalidCursorError for a bad `cursor`.
+    """
+    return (
+        _contacts_list_statement(db, q, has_email, has_phone, cursor, Contact)
+        .options(selectinload(Contact.company_ref))
+        .limit(limit)
+    )
+
+
+def contact_matches_statement(
+    db: Session,
+    q: str,
+    has_email: bool,
+    has_phone: bool,
+    limit: int,
+    candidate_ids: Iterable[int] | None = None,
+) -> Select:
+    """Rows of (id, sort_key) for a whole contacts list in page order, at most `limit`.
+
+    `candidate_ids`, when given, must include every match; the list is then read from those
+    rows by primary key instead of from the whole table.
+    """
+    stmt = _contacts_list_statement(db, q, has_email, has_phone, "", Contact.id)
+    if candidate_ids is not None:
+        stmt = stmt.where(Contact.id.in_(list(candidate_ids)))
+    return stmt.limit(limit)
+
+
+def contacts_page_url(q: str, has_email: bool, has_phone: bool, cursor: str) -> str:
+    params: dict[str, str] = {}
+    if q:
+        params["q"] = q
+    if has_email:
+        params["has_email"] = "true"
+    if has_phone:
+        params["has_phone"] = "true"
+    params["cursor"] = cursor
+    return "/contacts?" + urlencode(params)
+
+
+class ContactsPage(LazyRows[Contact]):
+    """Contacts of one list page, read lazily from `contacts_page_statement` rows.
+
+    The statement fetches one row past the page; when it exists, `next_page_url` is set to
+    `page_url(cursor)` once the page has been iterated (templates test it after the row loop).
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Row],
+        page_size: int,
+        page_url: Callable[[str], str],
+    ) -> None:
+        self.next_page_url: str | None = None
+        self._page_url = page_url
+        super().__init__(self._contacts(rows, page_size))
+
+    def _contacts(self, rows: Iterable[Row], page_size: int) -> Iterator[Contact]:
+        last: Row | None = None
+        for count, row in enumerate(rows):
+            if count == page_size:
+                contact, sort_value = last
+                self.next_page_url = self._page_url(encode_cursor(sort_value, contact.id))
+                return
+            last = row
+            yield row[0]
+
+
+def load_contact_detail(db: Session, contact_id: int) -> Contact | None:
+    """Load a contact and its company for the edit page (notes and activities come from
+    `load_timeline_page`)."""
+    return db.execute(
+        select(Contact).where(Contact.id == contact_id).options(selectinload(Contact.company_ref))
+    ).scalar_one_or_none()
+
+
+# Timeline filters: everything, notes only, all activities, or one activity type
+TIMELINE_FILTERS: tuple[str, ...] = ("", "note", "activity", *get_args(ActivityType))
+
+# Raw stored timestamps, for keyset comparisons (see _contact_sort_updated_at)
+_note_timeline_at = type_coerce(Note.created_at, String)
+_activity_timeline_at = type_coerce(Activity.activity_date, String)
+
+# A decoded timeline cursor: (raw timestamp, entry id, kind) of the last entry shown
+TimelineCursor = tuple[str, int, str]
+
+
+class TimelineEntry(NamedTuple):
+    kind: str  # "note" or "activity"
+    item: Note | Activity
+
+
+@dataclass
+class TimelinePage:
+    entries: list[TimelineEntry]
+    next_page_url: str | None
+
+
+def encode_timeline_cursor(at: str, entry_id: int, kind: str) -> str:
+    return _encode_json_cursor([at, entry_id, kind])
+
+
+def decode_timeline_cursor(cursor: str) -> TimelineCursor | None:
+    try:
+        at, entry_id, kind = _decode_json_cursor(cursor)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(at, str) or kind not in ("note", "activity"):
+        return None
+    if not _is_sqlite_integer(entry_id):
+        return None
+    # The raw stored text is kept for the comparison; it only has to be a timestamp
+    try:
+        datetime.fromisoformat(at)
+    except ValueError:
+        return None
+    return at, entry_id, kind
+
+
+def _timeline_branch(
+    kind: str,
+    entry_id: ColumnElement,
+    at: ColumnElement,
+    conditions: list[ColumnElement[bool]],
+    position: TimelineCursor | None,
+) -> Select:
+    stmt = select(literal(kind).label("kind"), entry_id.label("id"), at.label("at")).where(*conditions)
+    if position is None:
+        return stmt
+    # Entries after the cursor in (at, id, kind) descending order. kind is constant within a
+    # branch, so the bound is on (at, id) alone: inclusive only for the kind that sorts after
+    # the cursor's on a tie ("activity" follows "note").
+    cursor_at, cursor_id, cursor_kind = position
+    if kind < cursor_kind:
+        return stmt.where(tuple_(at, entry_id) <= (cursor_at, cursor_id))
+    return stmt.where(tuple_(at, entry_id) < (cursor_at, cursor_id))
+
+
+def timeline_statement(
+    contact_id: int, entry_filter: str, cursor: str, limit: int
+) -> Select | CompoundSelect:
+    """Rows of (kind, id, at) for one timeline page, newest first.
+
+    Notes (by created_at) and activities (by activity_date) are merged with UNION ALL; each
+    branch is read in order off its (contact_id, date) index and SQLite merges the two, so a
+    page reads about `limit` index entries however long the history is.
+    Raises InvalidCursorError for a bad `cursor`.
+    """
+    position = None
+    if cursor:
+        position = decode_timeline_cursor(cursor)
+        if position is None:
+            raise InvalidCursorError(cursor)
+
+    branches = []
+    if entry_filter in ("", "note"):
+        branches.append(
+            _timeline_branch("note", Note.id, _note_timeline_at, [Note.contact_id == contact_id], position)
+        )
+    if entry_filter != "note":
+        conditions = [Activity.contact_id == contact_id]
+        if entry_filter not in ("", "activity"):
+            conditions.append(Activity.type == entry_filter)
+        branches.append(
+            _timeline_branch("activity", Activity.id, _activity_timeline_at, conditions, position)
+        )
+
+    stmt = branches[0] if len(branches) == 1 else union_all(*branches)
+    columns = stmt.selected_columns
+    return stmt.order_by(columns.at.desc(), columns.id.desc(), columns.kind.desc()).limit(limit)
+
+
+def timeline_page_url(contact_id: int, entry_filter: str, cursor: str) -> str:
+    params = {"type": entry_filter} if entry_filter else {}
+    params["cursor"] = cursor
+    return f"/contacts/{contact_id}/timeline?" + urlencode(params)
+
+
+def load_timeline_page(
+    db: Session, contact_id: int, entry_filter: str, cursor: str, page_size: int
+) -> TimelinePage:
+    """One page of a contact's merged notes/activities timeline: the page query plus one
+    query each to load the notes and activities on it."""
+    rows = db.execute(timeline_statement(contact_id, entry_filter, cursor, page_size + 1)).all()
+    next_page_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_page_url = timeline_page_url(
+            contact_id, entry_filter, encode_timeline_cursor(last.at, last.id, last.kind)
+        )
+
+    items: dict[tuple[str, int], Note | Activity] = {}
+    for kind, model in (("note", Note), ("activity", Activity)):
+        ids = [row.id for row in rows if row.kind == kind]
+        if ids:
+            items.update(((kind, item.id), item) for item in db.scalars(select(model).where(model.id.in_(ids))))
+    # An entry deleted between the two queries is skipped
+    entries = [
+        TimelineEntry(row.kind, items[(row.kind, row.id)])
+        for row in rows
+        if (row.kind, row.id) in items
+    ]
+    return TimelinePage(entries, next_page_url)
@@ -0,0 +1,207 @@
+"""Contacts search as you type: abandoning superseded requests, and a short-lived result cache.
+
+The search box sends a request per pause in typing, each tagged with the page's search session
+and an increasing generation (X-Search-Session / X-Search-Generation headers). `SearchGenerations`
+remembers the newest generation per session, so a request that a newer one has overtaken (for
+example while waiting for a worker thread) is answered with 204 No Content, which HTMX ignores,
+before its query runs or its page renders.
+
+`SearchResultCache` keeps the complete match list of recent searches, (sort key, id) pairs in
+page order, keyed by (q, has_email, has_phone). Pages of a cached search only load their own
+contacts by primary key. When the user extends a cached search that is not ranked by FTS (the
+ILIKE fallback scans the table), the longer search is evaluated against the cached matches
+only: every match of "smit" is a match of "smi". Entries expire after SEARCH_CACHE_TTL_SECONDS
+and whenever the contacts or companies data version (see app.core.http_cache) moves, so a write
+is visible to the next search (the FTS index also covers the linked company's name). Searches matching more than SEARCH_CACHE_MAX_IDS contacts are not cached.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import (
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_MAX_IDS,
+    SEARCH_CACHE_TTL_SECONDS,
+)
+from app.core.contact_queries import (
+    ContactsCursor,
+    contact_matches_statement,
+    contacts_list_ranked,
+    contacts_page_statement,
+    decode_list_cursor,
+)
+from app.core.http_cache import data_versions
+from app.models import Contact
+
+# (session, generation) of a search-as-you-type request
+SearchGeneration = tuple[str, int]
+
+# (q, has_email, has_phone, ranked)
+_SearchKey = tuple[str, bool, bool, bool]
+
+# Tables a search matches against: contacts, and through contacts_fts the linked company name
+_SEARCH_TABLES = ("contacts", "companies")
+
+
+def search_generation(request: Request) -> SearchGeneration | None:
+    """The request's search session and generation, or None when it is not tagged with them."""
+    session = request.headers.get("X-Search-Session", "")
+    generation = request.headers.get("X-Search-Generation", "")
+    if not session or len(session) > 64 or not generation.isdigit():
+        return None
+    return session, int(generation)
+
+
+class SearchGenerations:
+    """Newest search generation seen per search session (bounded LRU of sessions)."""
+
+    def __init__(self, max_sessions: int = 4096) -> None:
+        self._lock = threading.Lock()
+        self._max_sessions = max_sessions
+        self._latest: OrderedDict[str, int] = OrderedDict()
+
+    def begin(self, search: SearchGeneration) -> bool:
+        """Record a request's generation; False when a newer one has already arrived."""
+        session, generation = search
+        with self._lock:
+            latest = self._latest.get(session)
+            if latest is not None and latest > generation:
+                return False
+            self._latest[session] = generation
+            self._latest.move_to_end(session)
+            if len(self._latest) > self._max_sessions:
+                self._latest.popitem(last=False)
+            return True
+
+    def is_current(self, search: SearchGeneration) -> bool:
+        session, generation = search
+        with self._lock:
+            return self._latest.get(session, generation) <= generation
+
+
+search_generations = SearchGenerations()
+
+
+@dataclass(frozen=True)
+class _CachedSearch:
+    matches: tuple[ContactsCursor, ...]  # (sort key, id) in page order
+    version: tuple[int, ...]  # data versions of _SEARCH_TABLES
+    expires_at: float
+
+
+class SearchResultCache:
+    """Complete match lists of recent contacts searches, for `page_rows`."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_ids: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_ids = max_ids
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_SearchKey, _CachedSearch] = OrderedDict()
+
+    def page_rows(
+        self,
+        db: Session,
+        q: str,
+        has_email: bool,
+        has_phone: bool,
+        cursor: str,
+        page_size: int,
+    ) -> list[Row] | list[tuple[Contact, float | str]]:
+        """Rows of (Contact, sort_key) for one search page plus the next page's first row, like
+        `contacts_page_statement(..., limit=page_size + 1)`. Raises InvalidCursorError."""
+        ranked = contacts_list_ranked(db, q)
+        position = decode_list_cursor(cursor, ranked) if cursor else None
+        # Read before the matches, in the same transaction (see app.core.http_cache)
+        versions = data_versions(db, _SEARCH_TABLES) if self.max_entries > 0 else None
+        if versions is None:
+            return db.execute(
+                contacts_page_statement(db, q, has_email, has_phone, cursor, page_size + 1)
+            ).all()
+
+        version = tuple(versions[table] for table in _SEARCH_TABLES)
+        key = (q, has_email, has_phone, ranked)
+        matches = self._get(key, version)
+        if matches is None:
+            if position is not None:
+                # A later page of a search too broad to cache (or expired since): keyset query
+                return db.execute(
+                    contacts_page_statement(db, q, has_email, has_phone, cursor, page_size + 1)
+                ).all()
+            candidates = None if ranked else self._refinement_candidates(key, version)
+            rows = db.execute(
+                contact_matches_statement(
+                    db, q, has_email, has_phone, self.max_ids + 1, candidate_ids=candidates
+                )
+            ).all()
+            matches = tuple((sort_key, contact_id) for contact_id, sort_key in rows)
+            if len(matches) <= self.max_ids:
+                self._put(key, matches, version)
+
+        start = 0
+        if position is not None:
+            # Searches ascend by (rank, id); the ILIKE fallback descends by (updated_at, id)
+            start = next(
+                (
+                    index
+                    for index, match in enumerate(matches)
+                    if (match > position if ranked else match < position)
+                ),
+                len(matches),
+            )
+        page = matches[start : start + page_size + 1]
+        contacts = {
+            contact.id: contact
+            for contact in db.scalars(
+                select(Contact)
+                .where(Contact.id.in_([contact_id for _, contact_id in page]))
+                .options(selectinload(Contact.company_ref))
+            )
+        }
+        return [
+            (contacts[contact_id], sort_key)
+            for sort_key, contact_id in page
+            if contact_id in contacts
+        ]
+
+    def _get(self, key: _SearchKey, version: tuple[int, ...]) -> tuple[ContactsCursor, ...] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.matches
+
+    def _put(
+        self, key: _SearchKey, matches: tuple[ContactsCursor, ...], version: tuple[int, ...]
+    ) -> None:
+        with self._lock:
+            self._entries[key] = _CachedSearch(matches, version, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refinement_candidates(
+        self, key: _SearchKey, version: tuple[int, ...]
+    ) -> list[int] | None:
+        """Ids matching the longest cached search that `key` extends (same filters), if any."""
+        q, has_email, has_phone, ranked = key
+        for length in range(len(q) - 1, 0, -1):
+            matches = self._get((q[:length], has_email, has_phone, ranked), version)
+            if matches is not None:
+                return [contact_id for _, contact_id in matches]
+        return None
+
+
+search_result_cache = SearchResultCache(
+    SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_MAX_IDS
+)
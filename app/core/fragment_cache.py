@@ -0,0 +1,94 @@
+"""In-process cache of rendered table rows (contacts and companies lists).
+
+A row's key holds everything its markup depends on (the row's id and updated_at, the linked
+company's, ...), so an edit changes the key instead of invalidating anything: stale entries are
+never looked up again and age out of the LRU. The cache is bounded by an estimate of the
+memory its keys and markup use (FRAGMENT_CACHE_MAX_BYTES); each worker process has its own.
+
+Rendering happens outside the lock, so two requests missing the same row may both render it.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from markupsafe import Markup
+
+from app.core.config import DEBUG, FRAGMENT_CACHE_MAX_BYTES
+
+# Per-entry bookkeeping not covered by getsizeof: the OrderedDict slot and its linked-list node
+_ENTRY_OVERHEAD_BYTES = 120
+
+
+def _entry_size(key: tuple[Hashable, ...], html: str) -> int:
+    return (
+        _ENTRY_OVERHEAD_BYTES
+        + sys.getsizeof(key)
+        + sum(sys.getsizeof(part) for part in key)
+        + sys.getsizeof(html)
+    )
+
+
+class FragmentCache:
+    """LRU of rendered fragments, bounded by their estimated size in bytes (0 disables it)."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Hashable, ...], tuple[Markup, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_render(self, key: tuple[Hashable, ...], render: Callable[[], str]) -> Markup:
+        if self.max_bytes <= 0:
+            return Markup(render())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        html = Markup(render())
+        size = _entry_size(key, html)
+        if size > self.max_bytes:
+            return html
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (html, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        return html
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.max_bytes > 0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Off with DEBUG: templates reload from disk there, and cached rows would hide template edits
+fragment_cache = FragmentCache(0 if DEBUG else FRAGMENT_CACHE_MAX_BYTES)
@@ -0,0 +1,99 @@
+"""Conditional GETs for the contact and company pages: weak ETags from data versions.
+
+Migration 012 keeps a "data:<table>" row per main table in cache_versions, bumped by triggers
+on every insert, update and delete whatever makes the write. A page's ETag hashes the versions
+of the tables it shows, whether the request is an HTMX one (that selects a fragment template)
+and a fingerprint of the application's code and templates, so a deploy changes every ETag too.
+Reading the versions is one primary-key lookup per table; when If-None-Match matches, the
+handler answers 304 before loading any rows or rendering a template.
+
+Read the versions before the page's rows: a write landing in between then makes the page newer
+than its ETag, which costs one extra 200 later, never a stale 304.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import DEBUG
+from app.models import CacheVersion
+
+_APP_DIR = Path(__file__).resolve().parent.parent
+
+# Tables whose rows each page renders
+CONTACTS_LIST_TABLES = ("contacts", "companies")
+COMPANIES_LIST_TABLES = ("companies",)
+CONTACT_PAGE_TABLES = ("contacts", "companies", "notes", "activities")
+
+# Clients may keep the page but must revalidate it before every reuse
+_CACHE_CONTROL = "private, no-cache"
+
+
+def data_versions(db: Session, tables: Iterable[str]) -> dict[str, int] | None:
+    """Current data version per table of `tables`; None when migration 012 has not been applied."""
+    names = [f"data:{table}" for table in tables]
+    rows = db.execute(
+        select(CacheVersion.name, CacheVersion.version).where(CacheVersion.name.in_(names))
+    ).all()
+    if len(rows) != len(names):
+        return None
+    return {name.removeprefix("data:"): version for name, version in rows}
+
+
+def _fingerprint_sources() -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(_APP_DIR.rglob("*")):
+        if path.suffix in (".py", ".html") and path.is_file():
+            digest.update(str(path.relative_to(_APP_DIR)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+_sources_fingerprint = cache(_fingerprint_sources)
+
+
+def page_etag(request: Request, versions: dict[str, int] | None) -> str | None:
+    """Weak ETag for a page built from data at `versions` (None: the page is not cacheable)."""
+    if versions is None:
+        return None
+    # With DEBUG, templates reload from disk, so edits must change the ETags too
+    fingerprint = _fingerprint_sources() if DEBUG else _sources_fingerprint()
+    digest = hashlib.blake2b(fingerprint.encode(), digest_size=12)
+    digest.update(b"htmx" if request.headers.get("HX-Request") else b"page")
+    for name, version in sorted(versions.items()):
+        digest.update(f";{name}={version}".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return any(candidate == "*" or candidate.removeprefix("W/") == opaque for candidate in candidates)
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": _CACHE_CONTROL, "Vary": "HX-Request"}
+
+
+def not_modified(request: Request, etag: str | None) -> Response | None:
+    """A 304 response when the client's copy is current, else None (render the page)."""
+    if etag is None or not _etag_matches(request, etag):
+        return None
+    return Response(status_code=304, headers=_cache_headers(etag))
+
+
+def with_etag(response: Response, etag: str | None) -> Response:
+    """Add the ETag and revalidation headers to a rendered page."""
+    if etag is not None:
+        response.headers.update(_cache_headers(etag))
+    return response
@@ -0,0 +1,258 @@
+"""Per-request performance instrumentation: wall time, SQL time and query count, template time.
+
+`RequestMetricsMiddleware` opens a `RequestStats` for every HTTP request in a context variable,
+so it follows the request into threadpool workers, streaming generators and the async driver's
+greenlets. Cursor events on the engines passed to `instrument_engine` add SQL time and count
+queries; the template environment adds render time through `template_timer`.
+
+When the response starts, the totals so far are sent as a `Server-Timing` header (for a
+streamed page that is the time to first byte, not the whole body). When the request is done
+the totals are recorded per route template in histograms served at /metrics in Prometheus
+text format, and requests running more than N_PLUS_ONE_QUERY_THRESHOLD queries are logged
+and counted as likely N+1 patterns.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import N_PLUS_ONE_QUERY_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Route label for requests no API route matched (404s, static files)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class RequestStats:
+    """Time and queries attributed to the current request so far."""
+
+    sql_seconds: float = 0.0
+    queries: int = 0
+    template_seconds: float = 0.0
+
+    def server_timing(self, wall_seconds: float) -> str:
+        return (
+            f"app;dur={wall_seconds * 1000:.1f}, "
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"tpl;dur={self.template_seconds * 1000:.1f}"
+        )
+
+
+_current_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    if _current_stats.get() is not None:
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    stats = _current_stats.get()
+    started = conn.info.get("metrics_query_started")
+    if stats is None or not started:
+        return
+    stats.sql_seconds += time.perf_counter() - started.pop()
+    stats.queries += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute the engine's statement time and count to the request that runs them."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def template_timer() -> Iterator[None]:
+    """Add the block's duration to the request's template time, minus queries run inside it
+    (a streamed template fetches its rows while rendering)."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    sql_before = stats.sql_seconds
+    try:
+        yield
+    finally:
+        stats.template_seconds += (time.perf_counter() - started) - (stats.sql_seconds - sql_before)
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket counts are cumulated when rendered."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _RouteSeries:
+    def __init__(self) -> None:
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.sql_duration = Histogram(DURATION_BUCKETS)
+        self.template_duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.n_plus_one = 0
+        self.responses: dict[int, int] = {}
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetrics:
+    """Per-(method, route) request histograms and counters, rendered for Prometheus."""
+
+    _HISTOGRAMS = (
+        ("crm_http_request_duration_seconds", "duration", "Request wall time"),
+        ("crm_http_request_sql_duration_seconds", "sql_duration", "Time spent in SQL statements"),
+        ("crm_http_request_template_duration_seconds", "template_duration", "Template render time"),
+        ("crm_http_request_queries", "queries", "SQL statements per request"),
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], _RouteSeries] = {}
+        self._requests = 0
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        wall_seconds: float,
+        stats: RequestStats,
+        n_plus_one: bool,
+    ) -> None:
+        with self._lock:
+            self._requests += 1
+            series = self._series.get((method, route))
+            if series is None:
+                series = self._series[(method, route)] = _RouteSeries()
+            series.duration.observe(wall_seconds)
+            series.sql_duration.observe(stats.sql_seconds)
+            series.template_duration.observe(stats.template_seconds)
+            series.queries.observe(stats.queries)
+            series.responses[status] = series.responses.get(status, 0) + 1
+            if n_plus_one:
+                series.n_plus_one += 1
+
+    def request_count(self) -> int:
+        """Requests completed since startup, all routes (sampled to derive the request rate)."""
+        with self._lock:
+            return self._requests
+
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            items = sorted(self._series.items())
+            lines: list[str] = []
+            for name, attribute, help_text in self._HISTOGRAMS:
+                lines.append(f"# HELP {name} {help_text}.")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), series in items:
+                    histogram: Histogram = getattr(series, attribute)
+                    labels = f'method="{_label_value(method)}",route="{_label_value(route)}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {float(histogram.sum)!r}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            lines.append("# HELP crm_http_responses_total Responses by status code.")
+            lines.append("# TYPE crm_http_responses_total counter")
+            for (method, route), series in items:
+                labels = f'method="{_label_value(method)}",route="{_label_value(route)}"'
+                for status, count in sorted(series.responses.items()):
+                    lines.append(f'crm_http_responses_total{{{labels},status="{status}"}} {count}')
+
+            lines.append(
+                "# HELP crm_http_n_plus_one_requests_total Requests over the N+1 query threshold."
+            )
+            lines.append("# TYPE crm_http_n_plus_one_requests_total counter")
+            for (method, route), series in items:
+                labels = f'method="{_label_value(method)}",route="{_label_value(route)}"'
+                lines.append(f"crm_http_n_plus_one_requests_total{{{labels}}} {series.n_plus_one}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware: Server-Timing header and per-route metrics for every HTTP request."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics = request_metrics,
+        n_plus_one_threshold: int = N_PLUS_ONE_QUERY_THRESHOLD,
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            # The router sets scope["route"] on the matched route (path_format has no convertors)
+            route = scope.get("route")
+            route_path = getattr(route, "path_format", None) or UNMATCHED_ROUTE
+            n_plus_one = stats.queries > self.n_plus_one_threshold
+            if n_plus_one:
+                logger.warning(
+                    "%s %s ran %d SQL statements (threshold %d): likely N+1 query pattern",
+                    scope["method"],
+                    route_path,
+                    stats.queries,
+                    self.n_plus_one_threshold,
+                )
+            self.metrics.observe(
+                scope["method"],
+                route_path,
+                status,
+                time.perf_counter() - started,
+                stats,
+                n_plus_one,
+            )
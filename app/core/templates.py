@@ -1,8 +1,192 @@
-"""Jinja2 templates for the application."""
+"""Jinja2 templates for the application.
 
+Compiled templates are kept in a filesystem bytecode cache, and outside DEBUG the environment
+never stats template files to check for changes (`auto_reload=False`): call
+`precompile_templates` at startup so no request pays for compiling one.
+
+List rows go through `cached_contact_row` / `cached_company_row` (template globals), which
+return a row's markup from the fragment cache and only render its macro on a miss.
+
+`stream_template` renders incrementally for pages whose rows come from a database cursor:
+the response starts as soon as the first chunk is ready instead of after the last row.
+"""
+
+from collections.abc import AsyncIterator, Iterable, Iterator
 from pathlib import Path
+from typing import Any, Generic, TypeVar
 
+import anyio
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from markupsafe import Markup
+
+from app.core.config import DB_READ_POOL_SIZE, DEBUG, TEMPLATE_BYTECODE_CACHE_DIR
+from app.core.fragment_cache import fragment_cache
+from app.core.metrics import template_timer
 
 _templates_dir = Path(__file__).resolve().parent.parent / "templates"
-templates = Jinja2Templates(directory=str(_templates_dir))
+
+# End-of-iterator sentinel
+_END: Any = object()
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    if not TEMPLATE_BYTECODE_CACHE_DIR:
+        return FileSystemBytecodeCache()
+    cache_dir = Path(TEMPLATE_BYTECODE_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(str(cache_dir))
+
+
+class _TimedTemplate(Template):
+    """Template whose rendering counts towards the request's template time (see app.core.metrics)."""
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        with template_timer():
+            return super().render(*args, **kwargs)
+
+    def generate(self, *args: Any, **kwargs: Any) -> Iterator[str]:
+        pieces = super().generate(*args, **kwargs)
+        while True:
+            with template_timer():
+                piece = next(pieces, _END)
+            if piece is _END:
+                return
+            yield piece
+
+
+_env = Environment(
+    loader=FileSystemLoader(str(_templates_dir)),
+    autoescape=True,
+    auto_reload=DEBUG,
+    bytecode_cache=_bytecode_cache(),
+    # Keep every template compiled in memory (the default of 400 would be fine today too)
+    cache_size=-1,
+)
+_env.template_class = _TimedTemplate
+
+
+def _row_macro(template_name: str, macro_name: str) -> Any:
+    return getattr(_env.get_template(template_name).module, macro_name)
+
+
+def cached_contact_row(contact: Any) -> Markup:
+    """Contacts list row. Keyed by what it shows: the contact's and its company's versions."""
+    company = contact.company_ref
+    key = (
+        "contact",
+        contact.id,
+        contact.updated_at,
+        contact.company_id,
+        company.updated_at if company is not None else None,
+    )
+    return fragment_cache.get_or_render(
+        key, lambda: _row_macro("contacts/_row_macros.html", "contact_row")(contact)
+    )
+
+
+def cached_company_row(company: Any) -> Markup:
+    """Companies list row. The trigger-maintained stats change without touching updated_at."""
+    key = ("company", company.id, company.updated_at, company.contact_count, company.last_activity_at)
+    return fragment_cache.get_or_render(
+        key, lambda: _row_macro("companies/_row_macros.html", "company_row")(company)
+    )
+
+
+_env.globals.update(cached_contact_row=cached_contact_row, cached_company_row=cached_company_row)
+templates = Jinja2Templates(env=_env)
+
+
+def precompile_templates() -> int:
+    """Load every template into the environment cache (and the bytecode cache). Returns the count."""
+    names = _env.list_templates(extensions=["html"])
+    for name in names:
+        _env.get_template(name)
+    return len(names)
+
+
+# Rendered text is sent in chunks of about this many characters: large enough to avoid a
+# network write per template node, small enough that the page shell goes out with the first rows.
+STREAM_CHUNK_CHARS = 16 * 1024
+
+T = TypeVar("T")
+
+
+class LazyRows(Generic[T]):
+    """Single-pass iterable over rows that are still being fetched.
+
+    Truthiness peeks at the first row only, so `{% if rows %}` in a template does not drain
+    the cursor before the page shell is rendered.
+    """
+
+    def __init__(self, rows: Iterable[T]) -> None:
+        self._rows = iter(rows)
+        self._peeked: list[T] = []
+
+    def __bool__(self) -> bool:
+        if not self._peeked:
+            first = next(self._rows, _END)
+            if first is _END:
+                return False
+            self._peeked.append(first)
+        return True
+
+    def __iter__(self) -> Iterator[T]:
+        yield from self._peeked
+        self._peeked.clear()
+        yield from self._rows
+
+
+def stream_template(name: str, context: dict[str, Any]) -> Iterator[str]:
+    """Render `name` incrementally, yielding chunks of roughly STREAM_CHUNK_CHARS characters.
+
+    Wrap the generator in a StreamingResponse; anything lazy in `context` (e.g. LazyRows over a
+    `yield_per` result) is consumed while the response is being sent, so open the session the
+    rows come from inside the generator that calls this.
+    """
+    buffer: list[str] = []
+    buffered = 0
+    for piece in _env.get_template(name).generate(context):
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= STREAM_CHUNK_CHARS:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+# Streams in flight at once (list pages and exports). A stream holds its read connection while
+# each chunk waits for a threadpool worker; if streams could take the whole read pool, workers
+# blocked on checkout would starve them (until pool_timeout). Capped at the pool size, the
+# overflow half of the read pool stays free for ordinary requests, which release their
+# connection without needing another worker. That needs a stream to hold only its own
+# connection: since FastAPI 0.118 a yield dependency such as get_read_db is closed after the
+# response is sent, so routes close their request session before returning a stream.
+_stream_slots = anyio.Semaphore(DB_READ_POOL_SIZE)
+
+
+async def _guarded_stream(chunks: Iterator[str]) -> AsyncIterator[str]:
+    async with _stream_slots:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+
+
+def streaming_response(
+    chunks: Iterator[str], media_type: str, headers: dict[str, str] | None = None
+) -> StreamingResponse:
+    """Response for a generator that reads from the read pool while the response is sent.
+
+    `chunks` does not start (or open its session) until one of the stream slots is free, and
+    holds the slot until it is exhausted or the client disconnects. Close the request's own
+    read session before returning this.
+    """
+    return StreamingResponse(_guarded_stream(chunks), media_type=media_type, headers=headers)
+
+
+def streaming_html(chunks: Iterator[str]) -> StreamingResponse:
+    """HTML response for `stream_template` output (or a generator that yields from it)."""
+    return streaming_response(chunks, "text/html; charset=utf-8")
@@ -0,0 +1,41 @@
+"""Async (aiosqlite) read-only engine and session dependency, used when DB_ASYNC is enabled.
+
+Mirrors `read_engine`: the same SQLite file opened `mode=ro`, with the reader PRAGMA profile
+and pool size, but driven by aiosqlite so handlers await queries instead of holding a
+threadpool worker. Only read-only handlers use it; writes go through the sync writer engine,
+which already serializes them on one connection.
+
+Import this module only when DB_ASYNC is on: creating the engine requires aiosqlite.
+"""
+
+from collections.abc import AsyncGenerator
+
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import DATABASE_URL, DB_POOL_TIMEOUT_SECONDS, DB_READ_POOL_SIZE
+from app.db.session import SQLITE_READER_PRAGMAS, read_only_sqlite_url, sqlite_pragma_listener
+
+_database_url = make_url(DATABASE_URL)
+if _database_url.get_backend_name() != "sqlite" or _database_url.database in (None, "", ":memory:"):
+    raise ValueError("DB_ASYNC requires DATABASE_URL to point at a SQLite database file")
+
+async_read_engine = create_async_engine(
+    read_only_sqlite_url(_database_url).set(drivername="sqlite+aiosqlite"),
+    connect_args={"check_same_thread": False},
+    echo=False,
+    pool_size=DB_READ_POOL_SIZE,
+    max_overflow=DB_READ_POOL_SIZE,
+    pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+)
+event.listen(
+    async_read_engine.sync_engine, "connect", sqlite_pragma_listener(SQLITE_READER_PRAGMAS)
+)
+
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False)
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency: an AsyncSession on the read-only aiosqlite pool (see get_read_db)."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,58 @@
+"""SQLite FTS5 contact search index (created by Alembic revision 005).
+
+The virtual table is kept out of Base.metadata so autogenerate never tries to manage it.
+Callers check `contacts_fts_available` and fall back to ILIKE search when it returns False
+(non-SQLite databases, or a database that has not been migrated yet).
+"""
+
+import re
+
+from sqlalchemy import Column, Engine, Float, Integer, MetaData, Table, inspect, literal_column
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+contacts_fts = Table(
+    "contacts_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("rank", Float),
+)
+
+_TOKEN_RE = re.compile(r"\S+")
+
+_fts_available_by_engine: dict[Engine, bool] = {}
+
+
+def contacts_fts_available(db: Session) -> bool:
+    """True when the session's database is SQLite and has the contacts_fts table.
+
+    Checked once per engine, on the session's own connection so small pools are never
+    asked for a second connection.
+    """
+    bind = db.get_bind()
+    available = _fts_available_by_engine.get(bind)
+    if available is None:
+        available = bind.dialect.name == "sqlite" and inspect(db.connection()).has_table(
+            "contacts_fts"
+        )
+        _fts_available_by_engine[bind] = available
+    return available
+
+
+def build_prefix_query(q: str) -> str | None:
+    """Turn free text into an FTS5 query: every term must match, the last token of each term as a prefix.
+
+    Terms are quoted so user input can never be parsed as FTS5 syntax. Returns None when no term
+    contains a searchable character.
+    """
+    terms = [
+        '"' + term.replace('"', '""') + '"*'
+        for term in _TOKEN_RE.findall(q)
+        if any(ch.isalnum() for ch in term)
+    ]
+    return " ".join(terms) or None
+
+
+def contacts_fts_match(query: str) -> ColumnElement[bool]:
+    """`contacts_fts MATCH :query` condition for a query built by `build_prefix_query`."""
+    return literal_column("contacts_fts").match(query)
@@ -0,0 +1,180 @@
+"""Database readiness report behind /health/ready.
+
+`check_readiness` runs a timed `SELECT 1`, compares the database's Alembic revision with the
+migration scripts' head, and describes the connection pools and the WAL. Reports are cached for
+HEALTH_READY_TTL_SECONDS so that frequent load-balancer probes cost the database at most one
+check per interval; concurrent probes wait for the check in progress instead of starting more.
+
+WAL state is read without touching the database: the WAL file size, and from the wal-index
+(`-shm`) header the frames written since the WAL was last reset and how many of them have been
+checkpointed into the database file. SQLite keeps no checkpoint timestamp, so the last
+checkpoint is the last one run through `run_wal_checkpoint` in this process.
+"""
+
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from functools import cache
+from typing import Any
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection, Engine, text
+
+from app.core.config import HEALTH_READY_TTL_SECONDS, PROJECT_ROOT
+
+# wal-index header (see https://sqlite.org/walformat.html): two copies of a 48-byte header, then
+# the checkpoint info. mxFrame (u32, offset 16 of a header copy) is the last valid WAL frame;
+# nBackfill (u32, offset 96) the number of frames already copied back into the database file.
+# Both are in the host's byte order.
+_WAL_INDEX_HEADER_SIZE = 48
+_WAL_INDEX_MX_FRAME_OFFSET = 16
+_WAL_INDEX_BACKFILL_OFFSET = 96
+
+_checkpoint_lock = threading.Lock()
+_last_checkpoint: dict[str, Any] | None = None
+
+
+@cache
+def migration_heads() -> frozenset[str]:
+    """Head revision(s) of the migration scripts shipped with the application."""
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return frozenset(ScriptDirectory.from_config(config).get_heads())
+
+
+def database_revisions(connection: Connection) -> frozenset[str]:
+    """Revision(s) recorded in alembic_version (empty when migrations never ran)."""
+    try:
+        return frozenset(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    except Exception:
+        connection.rollback()
+        return frozenset()
+
+
+def pool_stats(bind: Engine) -> dict[str, Any]:
+    """Connections checked in / checked out / in overflow for a QueuePool; the class otherwise."""
+    pool = bind.pool
+    stats: dict[str, Any] = {"pool": type(pool).__name__}
+    if all(hasattr(pool, name) for name in ("size", "checkedin", "checkedout", "overflow")):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return stats
+
+
+def sqlite_database_path(bind: Engine) -> str | None:
+    """Filesystem path of a SQLite file database (None for in-memory or other databases)."""
+    url = bind.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database.removeprefix("file:")
+
+
+def _wal_index_frames(path: str) -> tuple[int, int] | None:
+    """(mxFrame, nBackfill) from the wal-index, or None when it is absent or being rewritten."""
+    try:
+        with open(f"{path}-shm", "rb") as shm:
+            header = shm.read(_WAL_INDEX_BACKFILL_OFFSET + 4)
+    except OSError:
+        return None
+    if len(header) < _WAL_INDEX_BACKFILL_OFFSET + 4:
+        return None
+    # SQLite writes the two header copies in turn; if they differ a writer is mid-update
+    if header[:_WAL_INDEX_HEADER_SIZE] != header[_WAL_INDEX_HEADER_SIZE : 2 * _WAL_INDEX_HEADER_SIZE]:
+        return None
+    (mx_frame,) = struct.unpack_from("=I", header, _WAL_INDEX_MX_FRAME_OFFSET)
+    (backfilled,) = struct.unpack_from("=I", header, _WAL_INDEX_BACKFILL_OFFSET)
+    return mx_frame, backfilled
+
+
+def wal_status(path: str) -> dict[str, Any]:
+    """WAL size and checkpoint progress for the SQLite database at `path`."""
+    try:
+        size = os.path.getsize(f"{path}-wal")
+    except OSError:
+        size = 0
+    status: dict[str, Any] = {"size_bytes": size, "frames": None, "checkpointed_frames": None}
+    frames = _wal_index_frames(path)
+    if frames is not None:
+        status["frames"], status["checkpointed_frames"] = frames
+    with _checkpoint_lock:
+        status["last_checkpoint"] = dict(_last_checkpoint) if _last_checkpoint else None
+    return status
+
+
+def run_wal_checkpoint(connection: Connection, mode: str = "PASSIVE") -> dict[str, Any]:
+    """Run `PRAGMA wal_checkpoint(mode)` and remember the outcome for the readiness report.
+
+    Returns {"mode", "busy", "log_frames", "checkpointed_frames", "at"}; busy is true when the
+    checkpoint could not complete because of concurrent readers or writers.
+    """
+    global _last_checkpoint
+    busy, log_frames, checkpointed = connection.exec_driver_sql(
+        f"PRAGMA wal_checkpoint({mode})"
+    ).one()
+    result = {
+        "mode": mode,
+        "busy": bool(busy),
+        "log_frames": log_frames,
+        "checkpointed_frames": checkpointed,
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    with _checkpoint_lock:
+        _last_checkpoint = result
+    return result
+
+
+def check_readiness(writer: Engine, reader: Engine) -> dict[str, Any]:
+    """Run the readiness checks now. "ready" means the database answers and is migrated to head."""
+    database: dict[str, Any] = {"ok": False}
+    migrations: dict[str, Any] = {"ok": False, "head": sorted(migration_heads())}
+    started = time.perf_counter()
+    try:
+        with reader.connect() as connection:
+            connection.execute(text("SELECT 1")).scalar_one()
+            database.update(ok=True, latency_ms=round((time.perf_counter() - started) * 1000, 2))
+            current = database_revisions(connection)
+    except Exception as e:
+        cause = getattr(e, "orig", None) or e  # the DBAPI error, without SQLAlchemy's footer
+        database["error"] = f"{type(cause).__name__}: {cause}"
+    else:
+        migrations.update(ok=current == migration_heads(), current=sorted(current))
+
+    pools = {"writer": pool_stats(writer)}
+    if reader is not writer:
+        pools["reader"] = pool_stats(reader)
+    path = sqlite_database_path(writer)
+    return {
+        "status": "ready" if database["ok"] and migrations["ok"] else "not_ready",
+        "checked_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "checks": {"database": database, "migrations": migrations},
+        "pools": pools,
+        "wal": wal_status(path) if path is not None else None,
+    }
+
+
+class ReadinessCache:
+    """The last readiness report, re-checked once it is older than `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._report: dict[str, Any] | None = None
+        self._expires_at = 0.0
+
+    def get(self, writer: Engine, reader: Engine) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            if self._report is None or now >= self._expires_at:
+                self._report = check_readiness(writer, reader)
+                self._expires_at = now + self.ttl_seconds
+            return self._report
+
+
+readiness_cache = ReadinessCache(HEALTH_READY_TTL_SECONDS)
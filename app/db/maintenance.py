@@ -0,0 +1,215 @@
+"""Background SQLite maintenance: WAL checkpoints, statistics refresh and incremental vacuum.
+
+`MaintenanceScheduler` runs as a task on the application's event loop (started and stopped by
+the startup/shutdown hooks) and executes each due job in a worker thread on a writer
+connection, so jobs queue behind in-flight writes instead of contending for the write lock:
+
+- "wal_checkpoint": `PRAGMA wal_checkpoint(PASSIVE)` copies what it can of the WAL back into
+  the database without waiting on readers, so an open streamed page or export never holds up
+  the writer connection. Only when that completed every frame and the WAL file is larger than
+  MAINTENANCE_WAL_TRUNCATE_BYTES does a TRUNCATE checkpoint follow to reset it to zero bytes
+  (SQLite's automatic checkpoints never shrink it).
+- "optimize": `PRAGMA optimize` re-runs ANALYZE where the statistics have gone stale, with
+  `analysis_limit` bounding the work; a plain ANALYZE the first time, when there are none.
+- "incremental_vacuum": returns up to MAINTENANCE_VACUUM_PAGES free pages to the filesystem
+  (needs auto_vacuum=INCREMENTAL, set by migration 010).
+
+A due job is postponed while the request rate (from the metrics middleware) is above
+MAINTENANCE_MAX_REQUESTS_PER_SECOND, re-checking with exponential backoff. Every run is logged
+with its duration. With several server processes each runs its own scheduler; the jobs are
+idempotent, so that only costs some redundant work.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
+from sqlalchemy import Connection, Engine
+
+from app.core.config import (
+    MAINTENANCE_CHECKPOINT_INTERVAL_SECONDS,
+    MAINTENANCE_MAX_REQUESTS_PER_SECOND,
+    MAINTENANCE_OPTIMIZE_INTERVAL_SECONDS,
+    MAINTENANCE_VACUUM_INTERVAL_SECONDS,
+    MAINTENANCE_VACUUM_PAGES,
+    MAINTENANCE_WAL_TRUNCATE_BYTES,
+)
+from app.core.metrics import RequestMetrics, request_metrics
+from app.db.health import run_wal_checkpoint, sqlite_database_path
+
+logger = logging.getLogger(__name__)
+
+# Seconds between scheduler wake-ups (request rate samples); also the first backoff step
+POLL_SECONDS = 5.0
+# Rows ANALYZE examines per index under PRAGMA optimize (SQLite suggests 100-1000)
+ANALYSIS_LIMIT = 1000
+# PRAGMA optimize flags: 0x02 run ANALYZE where useful, 0x10000 consider every table, not only
+# those this connection has queried (ignored by SQLite versions that predate it)
+_OPTIMIZE_MASK = 0x10002
+
+JobResult = dict[str, Any]
+
+
+def _wal_size(connection: Connection) -> int:
+    path = sqlite_database_path(connection.engine)
+    if path is None:
+        return 0
+    try:
+        return os.path.getsize(f"{path}-wal")
+    except OSError:
+        return 0
+
+
+def checkpoint_wal(
+    connection: Connection, truncate_bytes: int = MAINTENANCE_WAL_TRUNCATE_BYTES
+) -> JobResult:
+    journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    if str(journal_mode).lower() != "wal":
+        return {"skipped": f"journal_mode is {journal_mode}"}
+    result = run_wal_checkpoint(connection, "PASSIVE")
+    wal_bytes = _wal_size(connection)
+    result["wal_bytes"] = wal_bytes
+    # TRUNCATE waits (up to busy_timeout) for readers still on the WAL; with every frame
+    # already copied back that wait is short, and it is only worth it for a large file
+    complete = not result["busy"] and result["checkpointed_frames"] == result["log_frames"]
+    if complete and wal_bytes > truncate_bytes:
+        truncated = run_wal_checkpoint(connection, "TRUNCATE")
+        result.update(truncated=not truncated["busy"], wal_bytes=_wal_size(connection))
+    else:
+        result["truncated"] = False
+    return result
+
+
+def optimize_statistics(connection: Connection) -> JobResult:
+    connection.exec_driver_sql(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+    has_statistics = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).first()
+    if has_statistics is None:
+        connection.exec_driver_sql("ANALYZE")
+        return {"analyze": "all tables"}
+    connection.exec_driver_sql(f"PRAGMA optimize={_OPTIMIZE_MASK}")
+    return {"analyze": "stale tables"}
+
+
+def incremental_vacuum(connection: Connection, pages: int = MAINTENANCE_VACUUM_PAGES) -> JobResult:
+    auto_vacuum = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+    if auto_vacuum != 2:
+        return {"skipped": "auto_vacuum is not INCREMENTAL (apply migration 010)"}
+    free_before = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+    if free_before:
+        # Each step of this pragma frees one page and Python's execute() steps only once;
+        # executescript() runs it to completion.
+        connection.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum({pages})")
+    free_after = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+    return {"freed_pages": free_before - free_after, "free_pages": free_after}
+
+
+@dataclass
+class MaintenanceJob:
+    name: str
+    interval_seconds: float
+    run: Callable[[Connection], JobResult]
+    next_run: float = 0.0
+    deferrals: int = field(default=0, repr=False)
+
+
+def default_jobs() -> list[MaintenanceJob]:
+    return [
+        MaintenanceJob("wal_checkpoint", MAINTENANCE_CHECKPOINT_INTERVAL_SECONDS, checkpoint_wal),
+        MaintenanceJob("optimize", MAINTENANCE_OPTIMIZE_INTERVAL_SECONDS, optimize_statistics),
+        MaintenanceJob("incremental_vacuum", MAINTENANCE_VACUUM_INTERVAL_SECONDS, incremental_vacuum),
+    ]
+
+
+class MaintenanceScheduler:
+    """Run maintenance jobs on `engine` at their intervals, postponed while traffic is high."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        jobs: list[MaintenanceJob],
+        max_requests_per_second: float = MAINTENANCE_MAX_REQUESTS_PER_SECOND,
+        metrics: RequestMetrics = request_metrics,
+    ) -> None:
+        self.engine = engine
+        self.jobs = jobs
+        self.max_requests_per_second = max_requests_per_second
+        self.metrics = metrics
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the scheduler task on the running event loop (SQLite file databases only)."""
+        if self._task is not None or sqlite_database_path(self.engine) is None:
+            return
+        now = time.monotonic()
+        for job in self.jobs:
+            job.next_run = now + job.interval_seconds
+        self._task = asyncio.create_task(self._run(), name="sqlite-maintenance")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        sampled_at = time.monotonic()
+        sampled_count = self.metrics.request_count()
+        while True:
+            await asyncio.sleep(POLL_SECONDS)
+            now = time.monotonic()
+            count = self.metrics.request_count()
+            rate = (count - sampled_count) / (now - sampled_at)
+            sampled_at, sampled_count = now, count
+
+            for job in self.jobs:
+                if now < job.next_run:
+                    continue
+                if rate > self.max_requests_per_second:
+                    job.deferrals += 1
+                    delay = min(POLL_SECONDS * 2**job.deferrals, job.interval_seconds)
+                    job.next_run = now + delay
+                    logger.info(
+                        "Maintenance job %s postponed %.0fs: %.1f requests/s (limit %s)",
+                        job.name,
+                        delay,
+                        rate,
+                        self.max_requests_per_second,
+                    )
+                    continue
+                job.deferrals = 0
+                await anyio.to_thread.run_sync(self._run_job, job)
+                job.next_run = time.monotonic() + job.interval_seconds
+
+    def _run_job(self, job: MaintenanceJob) -> None:
+        started = time.perf_counter()
+        try:
+            result = execute_job(self.engine, job)
+        except Exception:
+            logger.exception(
+                "Maintenance job %s failed after %.1f ms",
+                job.name,
+                (time.perf_counter() - started) * 1000,
+            )
+            return
+        duration_ms = result.pop("duration_ms")
+        logger.info("Maintenance job %s took %.1f ms: %s", job.name, duration_ms, result)
+
+
+def execute_job(engine: Engine, job: MaintenanceJob) -> JobResult:
+    """Run one job on a writer connection now; its result plus "duration_ms"."""
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        result = job.run(connection)
+        connection.commit()
+    return {**result, "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
@@ -0,0 +1,49 @@
+"""SQLite EXPLAIN QUERY PLAN helpers for guarding the hot query paths against regressions.
+
+`capture_statements` records the SQL a block of ORM code actually emits (including eager loads),
+`explain_query_plan` returns SQLite's plan for one of them and `query_plan_problems` flags the
+steps an indexed path should never need: a full table scan or a temporary B-tree for ORDER BY.
+"""
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+
+# "SCAN contacts" / "SCAN contacts AS c", but not "SCAN contacts USING [COVERING] INDEX ..."
+# (an index walk in ORDER BY order, stopped by LIMIT) nor virtual-table scans.
+_FULL_SCAN_RE = re.compile(r"^SCAN \S+( AS \S+)?$")
+
+CapturedStatement = tuple[str, Any]
+
+
+@contextmanager
+def capture_statements(bind: Engine) -> Iterator[list[CapturedStatement]]:
+    """Collect (sql, parameters) for every statement executed on `bind` inside the block."""
+    captured: list[CapturedStatement] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        captured.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def explain_query_plan(connection: Connection, statement: str, parameters: Any) -> list[str]:
+    """The detail column of EXPLAIN QUERY PLAN for a captured statement, in plan order."""
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return [row[-1] for row in rows]
+
+
+def query_plan_problems(plan: list[str]) -> list[str]:
+    """Plan steps that mean a full table scan or a sort the indexes should have avoided."""
+    return [
+        step
+        for step in plan
+        if _FULL_SCAN_RE.match(step) or step.startswith("USE TEMP B-TREE")
+    ]
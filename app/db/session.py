@@ -2,36 +2,168 @@
 
 SQLite database file is created when the engine is first created (first connection)
 or when Alembic migrations are applied.
+
+Two engines share the database: `engine` is the writer (small pool, so writes queue in-process
+instead of contending for SQLite's single write lock) and `read_engine` serves read-only
+requests from a larger pool of `mode=ro` query-only connections. For in-memory SQLite and
+non-SQLite databases `read_engine` is the writer engine.
 """
 
-from collections.abc import Generator
+import logging
+from collections.abc import Callable, Generator
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import URL, Engine, create_engine, event, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.config import DATABASE_URL
+from app.core.config import (
+    DATABASE_URL,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_READ_POOL_SIZE,
+    DB_WRITE_POOL_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_TEMP_STORE,
+)
 from app.db.base import Base
 
+logger = logging.getLogger(__name__)
+
+# Engine profile applied on every new SQLite connection, in this order. busy_timeout comes first
+# so that switching journal_mode waits for other connections instead of failing immediately.
+SQLITE_PRAGMAS: dict[str, str] = {
+    "busy_timeout": str(SQLITE_BUSY_TIMEOUT_MS),
+    "foreign_keys": "ON",
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "temp_store": SQLITE_TEMP_STORE,
+    "mmap_size": str(SQLITE_MMAP_SIZE),
+    "cache_size": str(SQLITE_CACHE_SIZE),
+}
+
+# PRAGMA read-backs that report numbers for symbolic settings
+_PRAGMA_SYMBOLS: dict[str, tuple[str, ...]] = {
+    "foreign_keys": ("OFF", "ON"),
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+}
+
 # connect_args for SQLite: create file on first connection; check_same_thread=False for FastAPI
 connect_args = {}
 if DATABASE_URL.startswith("sqlite"):
     connect_args["check_same_thread"] = False
 
+_database_url = make_url(DATABASE_URL)
+_is_sqlite_file = _database_url.get_backend_name() == "sqlite" and _database_url.database not in (
+    None,
+    "",
+    ":memory:",
+)
+
+# Pool sizing only applies to file databases (in-memory SQLite uses a per-thread singleton pool)
+_writer_pool_args: dict[str, int] = {}
+if _is_sqlite_file:
+    _writer_pool_args = {
+        "pool_size": DB_WRITE_POOL_SIZE,
+        "max_overflow": 0,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+    }
+
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
     echo=False,
+    **_writer_pool_args,
 )
 
-if DATABASE_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def _enable_sqlite_foreign_keys(dbapi_connection, _connection_record) -> None:  # type: ignore[no-untyped-def]
+
+def read_only_sqlite_url(url: URL) -> URL:
+    """The same SQLite file database opened read-only (`mode=ro` URI)."""
+    return url.set(
+        database=f"file:{url.database}",
+        query={**url.query, "mode": "ro", "uri": "true"},
+    )
+
+
+if _is_sqlite_file:
+    read_engine = create_engine(
+        read_only_sqlite_url(_database_url),
+        connect_args=connect_args,
+        echo=False,
+        pool_size=DB_READ_POOL_SIZE,
+        max_overflow=DB_READ_POOL_SIZE,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+    )
+else:
+    read_engine = engine
+
+
+# Read-only connections: journal_mode is persistent in the file and cannot be changed on them
+SQLITE_READER_PRAGMAS: dict[str, str] = {
+    **{k: v for k, v in SQLITE_PRAGMAS.items() if k != "journal_mode"},
+    "query_only": "ON",
+}
+
+
+def sqlite_pragma_listener(pragmas: dict[str, str]) -> Callable[..., None]:
+    """Build a "connect" event handler that applies `pragmas` in order."""
+
+    def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:  # type: ignore[no-untyped-def]
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
         cursor.close()
 
+    return _apply_sqlite_pragmas
+
+
+if DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", sqlite_pragma_listener(SQLITE_PRAGMAS))
+if read_engine is not engine:
+    event.listen(read_engine, "connect", sqlite_pragma_listener(SQLITE_READER_PRAGMAS))
+
+
+def sqlite_pragma_report(bind: Engine) -> dict[str, tuple[str, str]]:
+    """Read back each profile PRAGMA from a pooled connection: {pragma: (requested, actual)}.
+
+    Returns an empty dict for non-SQLite engines.
+    """
+    if bind.dialect.name != "sqlite":
+        return {}
+    report: dict[str, tuple[str, str]] = {}
+    with bind.connect() as connection:
+        for pragma, requested in SQLITE_PRAGMAS.items():
+            value = connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+            actual = "UNSUPPORTED" if value is None else str(value)
+            symbols = _PRAGMA_SYMBOLS.get(pragma)
+            if symbols is not None and actual.isdigit() and int(actual) < len(symbols):
+                actual = symbols[int(actual)]
+            report[pragma] = (requested, actual.upper())
+    return report
+
+
+def log_sqlite_profile(bind: Engine) -> None:
+    """Log the effective SQLite engine profile; warn for any PRAGMA SQLite did not accept.
+
+    In-memory databases, for example, cannot use WAL and report journal_mode=MEMORY.
+    """
+    report = sqlite_pragma_report(bind)
+    if not report:
+        return
+    logger.info(
+        "SQLite engine profile: %s",
+        ", ".join(f"{pragma}={actual}" for pragma, (_, actual) in report.items()),
+    )
+    for pragma, (requested, actual) in report.items():
+        if requested.upper() != actual:
+            logger.warning("SQLite PRAGMA %s requested %s but is %s", pragma, requested, actual)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -43,6 +175,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """FastAPI dependency for read-only handlers: a session on the read-only pool.
+
+    Any write through this session fails ("attempt to write a readonly database"); use get_db
+    for handlers that mutate.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 @contextmanager
 def get_db_context() -> Generator[Session, None, None]:
     """Context manager for database session outside of FastAPI (e.g. migrations)."""
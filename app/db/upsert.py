@@ -0,0 +1,35 @@
+"""Dialect-aware INSERT ... ON CONFLICT DO NOTHING for race-free get-or-create."""
+
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_INSERT_BY_DIALECT = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def insert_ignoring_conflicts(
+    db: Session,
+    model: type[Any],
+    rows: list[dict[str, Any]],
+    index_elements: list[str],
+) -> int:
+    """Insert `rows` into `model`'s table, skipping rows that hit the unique `index_elements`.
+
+    Returns the number of rows inserted. Dialects without ON CONFLICT fall back to a plain
+    INSERT, which raises IntegrityError on a conflict.
+    """
+    if not rows:
+        return 0
+    table = model.__table__
+    dialect_insert = _INSERT_BY_DIALECT.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        stmt = insert(table)
+    else:
+        stmt = dialect_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    # Core (not ORM bulk) insert, so rowcount is the number of rows actually written
+    return db.execute(stmt, rows).rowcount
@@ -5,7 +5,12 @@ from pathlib import Path
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from app.routes import companies, contacts, health, home
+from app.core.config import DB_ASYNC, MAINTENANCE_ENABLED
+from app.core.metrics import RequestMetricsMiddleware, instrument_engine
+from app.core.templates import precompile_templates
+from app.db.maintenance import MaintenanceScheduler, default_jobs
+from app.db.session import engine, log_sqlite_profile, read_engine
+from app.routes import admin, companies, contact_import, contacts, export, health, home, metrics
 
 app = FastAPI(
     title="Python CRM",
@@ -13,24 +18,51 @@ app = FastAPI(
     version="0.1.0",
 )
 
+# Request instrumentation: Server-Timing header, /metrics histograms, N+1 warnings
+app.add_middleware(RequestMetricsMiddleware)
+instrument_engine(engine)
+if read_engine is not engine:
+    instrument_engine(read_engine)
+
 # Static files: app/static/
 static_dir = Path(__file__).resolve().parent / "static"
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 # Routes
 app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
+app.include_router(admin.router, tags=["admin"])
 app.include_router(home.router, tags=["home"])
+if DB_ASYNC:
+    # Registered first, so these async handlers take the read-only pages from the sync routers
+    from app.db.async_session import async_read_engine
+    from app.routes import async_reads
+
+    instrument_engine(async_read_engine.sync_engine)
+    app.include_router(async_reads.router, tags=["async"])
+app.include_router(contact_import.router, tags=["contacts"])
 app.include_router(contacts.router, tags=["contacts"])
 app.include_router(companies.router, tags=["companies"])
+app.include_router(export.router, tags=["export"])
+
+maintenance = MaintenanceScheduler(engine, default_jobs())
 
 
 @app.on_event("startup")
 async def startup() -> None:
-    """Application startup (optional future use)."""
-    pass
+    """Application startup: report the effective database engine profile, compile templates,
+    start background database maintenance."""
+    log_sqlite_profile(engine)
+    precompile_templates()
+    if MAINTENANCE_ENABLED:
+        maintenance.start()
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
-    """Application shutdown (optional future use)."""
-    pass
+    """Application shutdown: stop maintenance, close the async read pool when DB_ASYNC is on."""
+    await maintenance.stop()
+    if DB_ASYNC:
+        from app.db.async_session import async_read_engine
+
+        await async_read_engine.dispose()
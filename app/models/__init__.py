@@ -1,8 +1,9 @@
 """Domain models."""
 
 from app.models.activity import Activity
+from app.models.cache_version import CacheVersion
 from app.models.company import Company
 from app.models.contact import Contact
 from app.models.note import Note
 
-__all__ = ["Activity", "Company", "Contact", "Note"]
+__all__ = ["Activity", "CacheVersion", "Company", "Contact", "Note"]
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -18,10 +18,11 @@ class Activity(Base):
     """Activity entity: id, contact_id (FK), type (call/email/meeting/task), description, activity_date, created_at, updated_at."""
 
     __tablename__ = "activities"
+    __table_args__ = (Index("ix_activities_contact_id_activity_date", "contact_id", "activity_date"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     contact_id: Mapped[int] = mapped_column(
-        ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False
     )
     type: Mapped[str] = mapped_column(String(32), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
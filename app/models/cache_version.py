@@ -0,0 +1,15 @@
+"""Cache version model: per-cache change counters shared by every worker process."""
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CacheVersion(Base):
+    """Cache version entity: name (PK, e.g. "companies"), version (bumped in the writing transaction)."""
+
+    __tablename__ = "cache_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -5,8 +5,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, String, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.db.base import Base
 
@@ -14,21 +14,41 @@ if TYPE_CHECKING:
     from app.models.contact import Contact
 
 
+def normalize_company_name(name: str) -> str:
+    """Lookup key for a company name: trimmed, inner whitespace collapsed, lowercased."""
+    return " ".join(name.split()).lower()
+
+
 class Company(Base):
-    """Company entity: id, name (required), created_at, updated_at."""
+    """Company entity: id, name (required), name_normalized (indexed lookup key), created_at, updated_at."""
 
     __tablename__ = "companies"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name_normalized: Mapped[str] = mapped_column(
+        String(255), nullable=False, server_default="", index=True, unique=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
+    # Denormalized for the companies list, kept current by database triggers (migration 011);
+    # `python -m app.cli rebuild-company-stats` recomputes them.
+    contact_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_activity_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
+    # passive_deletes: ON DELETE SET NULL unlinks the contacts (and fires their triggers)
+    # without loading them
     contacts: Mapped[list["Contact"]] = relationship(
         "Contact",
         back_populates="company_ref",
+        passive_deletes=True,
     )
+
+    @validates("name")
+    def _sync_name_normalized(self, _key: str, name: str) -> str:
+        self.name_normalized = normalize_company_name(name)
+        return name
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -21,6 +21,7 @@ class Contact(Base):
     """Contact entity with legacy company text and optional company reference."""
 
     __tablename__ = "contacts"
+    __table_args__ = (Index("ix_contacts_updated_at_id", "updated_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -43,9 +44,21 @@ class Contact(Base):
         "Company",
         back_populates="contacts",
     )
-    notes: Mapped[list["Note"]] = relationship("Note", back_populates="contact")
+    # Ordered newest first, as the contact page lists them. Deleting a contact leaves its notes
+    # and activities to ON DELETE CASCADE (the ORM would otherwise null their contact_id).
+    notes: Mapped[list["Note"]] = relationship(
+        "Note",
+        back_populates="contact",
+        order_by="Note.created_at.desc()",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     activities: Mapped[list["Activity"]] = relationship(
-        "Activity", back_populates="contact"
+        "Activity",
+        back_populates="contact",
+        order_by="Activity.activity_date.desc()",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     @hybrid_property
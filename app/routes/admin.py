@@ -0,0 +1,14 @@
+"""Operator endpoints: in-process cache statistics for this worker."""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.fragment_cache import fragment_cache
+
+router = APIRouter()
+
+
+@router.get("/admin/fragment-cache", response_class=JSONResponse)
+def fragment_cache_stats() -> JSONResponse:
+    """Row fragment cache size and hit rate since the worker started (each worker has its own)."""
+    return JSONResponse(fragment_cache.stats())
@@ -0,0 +1,215 @@
+"""Async versions of the read-only contact and company pages, mounted ahead of the sync routes when DB_ASYNC is on.
+
+Handlers await queries on the aiosqlite read engine instead of occupying a threadpool worker
+for the whole request. The query code is shared with the sync routes through
+`AsyncSession.run_sync`, so both stacks always run the same statements. Pages are rendered
+in one piece (the sync list pages stream): Jinja cannot iterate an async cursor, and a
+contacts page is bounded by CONTACTS_PAGE_SIZE anyway. The companies list is not bounded, so
+it stays on the sync route, which streams it from a `yield_per` cursor in a stream slot.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.company_directory import company_directory
+from app.core.config import COMPANY_SEARCH_LIMIT, CONTACTS_PAGE_SIZE, TIMELINE_PAGE_SIZE
+from app.core.contact_queries import (
+    TIMELINE_FILTERS,
+    ContactsPage,
+    InvalidCursorError,
+    TimelinePage,
+    contacts_page_statement,
+    contacts_page_url,
+    load_contact_detail,
+    load_timeline_page,
+)
+from app.core.contact_facets import facet_cache
+from app.core.contact_search import search_generation, search_generations, search_result_cache
+from app.core.http_cache import (
+    CONTACT_PAGE_TABLES,
+    CONTACTS_LIST_TABLES,
+    data_versions,
+    not_modified,
+    page_etag,
+    with_etag,
+)
+from app.core.templates import templates
+from app.db.async_session import get_async_read_db
+from app.models import Company, Contact
+
+router = APIRouter()
+
+
+@router.get("/contacts", response_class=HTMLResponse)
+async def list_contacts(
+    request: Request,
+    q: str = Query(default=""),
+    has_email: bool = Query(default=False),
+    has_phone: bool = Query(default=False),
+    cursor: str = Query(default=""),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    search = search_generation(request)
+    if search is not None and not search_generations.begin(search):
+        return Response(status_code=204)
+    etag = page_etag(request, await db.run_sync(data_versions, CONTACTS_LIST_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    q = q.strip()
+    cursor = cursor.strip()
+    try:
+        if q:
+            rows = await db.run_sync(
+                search_result_cache.page_rows, q, has_email, has_phone, cursor, CONTACTS_PAGE_SIZE
+            )
+        else:
+            stmt = await db.run_sync(
+                contacts_page_statement, q, has_email, has_phone, cursor, CONTACTS_PAGE_SIZE + 1
+            )
+            rows = (await db.execute(stmt)).all()
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if search is not None and not search_generations.is_current(search):
+        return Response(status_code=204)
+    contacts = ContactsPage(
+        rows,
+        CONTACTS_PAGE_SIZE,
+        lambda next_cursor: contacts_page_url(q, has_email, has_phone, next_cursor),
+    )
+
+    context = {
+        "request": request,
+        "contacts": contacts,
+        "q": q,
+        "has_email": has_email,
+        "has_phone": has_phone,
+    }
+    if request.headers.get("HX-Request"):
+        template = "contacts/_contact_rows.html" if cursor else "contacts/_contacts_table.html"
+    else:
+        template = "contacts/list.html"
+    return with_etag(templates.TemplateResponse(template, context), etag)
+
+
+@router.get("/contacts/facets", response_class=HTMLResponse)
+async def contact_facets(
+    request: Request,
+    q: str = Query(default=""),
+    has_email: bool = Query(default=False),
+    has_phone: bool = Query(default=False),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    etag = page_etag(request, await db.run_sync(data_versions, CONTACTS_LIST_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    facets = await db.run_sync(facet_cache.get, q, has_email, has_phone)
+    return with_etag(
+        templates.TemplateResponse("contacts/_facets.html", {"request": request, "facets": facets}),
+        etag,
+    )
+
+
+async def _timeline_page(
+    db: AsyncSession, contact_id: int, entry_filter: str, cursor: str
+) -> TimelinePage:
+    if entry_filter not in TIMELINE_FILTERS:
+        raise HTTPException(status_code=400, detail="Invalid timeline filter")
+    try:
+        return await db.run_sync(
+            load_timeline_page, contact_id, entry_filter, cursor, TIMELINE_PAGE_SIZE
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/contacts/{contact_id:int}/edit", response_class=HTMLResponse)
+async def edit_contact(
+    request: Request,
+    contact_id: int,
+    type: str = Query(default=""),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    etag = page_etag(request, await db.run_sync(data_versions, CONTACT_PAGE_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    contact = await db.run_sync(load_contact_detail, contact_id)
+    if contact is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return with_etag(
+        templates.TemplateResponse(
+            "contacts/edit.html",
+            {
+                "request": request,
+                "contact": contact,
+                "timeline": await _timeline_page(db, contact_id, type, ""),
+                "timeline_filter": type,
+                "timeline_filters": TIMELINE_FILTERS,
+                "errors": [],
+                "selected_company": contact.company_ref,
+            },
+        ),
+        etag,
+    )
+
+
+@router.get("/contacts/{contact_id:int}/timeline", response_class=HTMLResponse)
+async def contact_timeline(
+    request: Request,
+    contact_id: int,
+    type: str = Query(default=""),
+    cursor: str = Query(default=""),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    etag = page_etag(request, await db.run_sync(data_versions, CONTACT_PAGE_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    if await db.get(Contact, contact_id) is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return with_etag(
+        templates.TemplateResponse(
+            "contacts/_timeline_page.html",
+            {
+                "request": request,
+                "timeline": await _timeline_page(db, contact_id, type, cursor.strip()),
+            },
+        ),
+        etag,
+    )
+
+
+@router.get("/companies/search", response_class=HTMLResponse)
+async def search_companies(
+    request: Request,
+    q: str = Query(default=""),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> HTMLResponse:
+    """Typeahead fragment for the contact forms: top prefix matches on the normalized name."""
+    return templates.TemplateResponse(
+        "companies/_search_results.html",
+        {
+            "request": request,
+            "q": q.strip(),
+            "companies": await db.run_sync(company_directory.search, q, COMPANY_SEARCH_LIMIT),
+        },
+    )
+
+
+@router.get("/companies/{company_id:int}/edit", response_class=HTMLResponse)
+async def edit_company(
+    request: Request,
+    company_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> HTMLResponse:
+    company = await db.get(Company, company_id)
+    if company is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    return templates.TemplateResponse(
+        "companies/edit.html",
+        {"request": request, "company": company, "errors": []},
+    )
@@ -1,31 +1,94 @@
 """Company CRUD routes."""
 
+from collections.abc import Iterator
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from pydantic import ValidationError
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.templates import templates
-from app.db.session import get_db
+from app.core.company_directory import bump_company_directory_version, company_directory
+from app.core.config import COMPANY_SEARCH_LIMIT, LIST_FETCH_SIZE
+from app.core.http_cache import COMPANIES_LIST_TABLES, data_versions, not_modified, page_etag, with_etag
+from app.core.templates import LazyRows, stream_template, streaming_html, templates
+from app.db.session import ReadSessionLocal, get_db, get_read_db
 from app.models import Company
+from app.models.company import normalize_company_name
 from app.schemas.company import CompanyFormSchema
 
 router = APIRouter()
 
 
+_DUPLICATE_NAME_ERROR = "A company with this name already exists"
+
+
 def _get_company_or_404(db: Session, company_id: int) -> Company | None:
     return db.get(Company, company_id)
 
 
+def _company_name_taken(db: Session, name: str, exclude_id: int | None = None) -> bool:
+    stmt = select(Company.id).where(Company.name_normalized == normalize_company_name(name))
+    if exclude_id is not None:
+        stmt = stmt.where(Company.id != exclude_id)
+    return db.execute(stmt.limit(1)).first() is not None
+
+
+def _new_company_duplicate_response(request: Request, name: str) -> HTMLResponse:
+    return templates.TemplateResponse(
+        "companies/new.html",
+        {
+            "request": request,
+            "errors": [_DUPLICATE_NAME_ERROR],
+            "form_name": name,
+        },
+        status_code=200,
+    )
+
+
+def _stream_companies_list(request: Request) -> Iterator[str]:
+    """Render the companies list while rows are fetched (session owned by the stream).
+
+    Ordered by the indexed normalized name, so the first rows arrive without a full sort.
+    """
+    with ReadSessionLocal() as db:
+        companies = db.execute(
+            select(Company)
+            .order_by(Company.name_normalized.asc())
+            .execution_options(yield_per=LIST_FETCH_SIZE)
+        ).scalars()
+        yield from stream_template(
+            "companies/list.html",
+            {"request": request, "companies": LazyRows(companies)},
+        )
+
+
 @router.get("/companies", response_class=HTMLResponse)
-def list_companies(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
-    companies = db.execute(select(Company).order_by(Company.name.asc())).scalars().all()
+def list_companies(request: Request, db: Session = Depends(get_read_db)) -> Response:
+    etag = page_etag(request, data_versions(db, COMPANIES_LIST_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    db.close()  # the stream reads with its own session (see app.core.templates)
+    return with_etag(streaming_html(_stream_companies_list(request)), etag)
+
+
+@router.get("/companies/search", response_class=HTMLResponse)
+def search_companies(
+    request: Request,
+    q: str = Query(default=""),
+    db: Session = Depends(get_read_db),
+) -> HTMLResponse:
+    """Typeahead fragment for the contact forms: top prefix matches on the normalized name."""
     return templates.TemplateResponse(
-        "companies/list.html",
-        {"request": request, "companies": companies},
+        "companies/_search_results.html",
+        {
+            "request": request,
+            "q": q.strip(),
+            "companies": company_directory.search(db, q, COMPANY_SEARCH_LIMIT),
+        },
     )
 
 
@@ -57,9 +120,18 @@ def create_company(
             status_code=200,
         )
 
+    if _company_name_taken(db, data.name):
+        return _new_company_duplicate_response(request, name)
+
     company = Company(name=data.name)
     db.add(company)
-    db.commit()
+    bump_company_directory_version(db)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request created the same name between the check and the commit
+        db.rollback()
+        return _new_company_duplicate_response(request, name)
     return RedirectResponse(url="/companies", status_code=303)
 
 
@@ -67,7 +139,7 @@ def create_company(
 def edit_company(
     request: Request,
     company_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> HTMLResponse:
     company = _get_company_or_404(db, company_id)
     if company is None:
@@ -105,8 +177,21 @@ def update_company(
             status_code=200,
         )
 
+    if _company_name_taken(db, data.name, exclude_id=company_id):
+        return templates.TemplateResponse(
+            "companies/edit.html",
+            {
+                "request": request,
+                "company": company,
+                "errors": [_DUPLICATE_NAME_ERROR],
+                "form_name": name,
+            },
+            status_code=200,
+        )
+
     company.name = data.name
     company.updated_at = datetime.utcnow()
+    bump_company_directory_version(db)
     db.commit()
     return RedirectResponse(url="/companies", status_code=303)
 
@@ -122,6 +207,7 @@ def delete_company(
         raise HTTPException(status_code=404, detail="Company not found")
 
     db.delete(company)
+    bump_company_directory_version(db)
     db.commit()
 
     if request.headers.get("HX-Request") == "true":
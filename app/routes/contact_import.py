@@ -0,0 +1,53 @@
+"""Bulk contact import routes: upload a CSV or JSONL file, get a per-row error report."""
+
+import io
+
+from fastapi import APIRouter, File, Form, Request, UploadFile
+from fastapi.responses import HTMLResponse
+
+from app.core.config import IMPORT_BATCH_SIZE
+from app.core.contact_import import (
+    IMPORT_FORMATS,
+    ImportFormatError,
+    detect_format,
+    import_contacts,
+    iter_records,
+)
+from app.core.templates import templates
+from app.db.session import SessionLocal
+
+router = APIRouter()
+
+
+@router.get("/contacts/import", response_class=HTMLResponse)
+def import_contacts_form(request: Request) -> HTMLResponse:
+    return templates.TemplateResponse(
+        "contacts/import.html",
+        {"request": request, "errors": [], "report": None},
+    )
+
+
+@router.post("/contacts/import", response_class=HTMLResponse)
+def import_contacts_upload(
+    request: Request,
+    file: UploadFile = File(...),
+    format: str = Form(""),
+) -> HTMLResponse:
+    """Stream the uploaded file through the batched import; sessions are opened per batch."""
+    fmt = format.strip().lower() or detect_format(file.filename)
+    errors: list[str] = []
+    report = None
+    if fmt not in IMPORT_FORMATS:
+        errors.append("Choose a format or upload a .csv / .jsonl file")
+    else:
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_contacts(SessionLocal, iter_records(stream, fmt), IMPORT_BATCH_SIZE)
+        except (ImportFormatError, UnicodeDecodeError) as e:
+            errors.append(str(e))
+        finally:
+            stream.detach()
+    return templates.TemplateResponse(
+        "contacts/import.html",
+        {"request": request, "errors": errors, "report": report},
+    )
@@ -1,29 +1,86 @@
 """Contact CRUD routes. Forms are application/x-www-form-urlencoded; use Form(...); validate with Pydantic; on validation errors re-render template (HTTP 200)."""
 
+import json
+from collections.abc import Callable, Iterator
+from dataclasses import asdict
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from pydantic import ValidationError
-from sqlalchemy import or_, select
-from sqlalchemy.orm import Session, selectinload
-
-from app.core.templates import templates
-from app.db.session import get_db
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.core.company_directory import bump_company_directory_version
+from app.core.contact_bulk import (
+    BULK_ACTIONS,
+    BulkResult,
+    BulkTarget,
+    delete_contacts,
+    link_legacy_companies,
+    parse_contact_ids,
+    reassign_company,
+)
+from app.core.config import CONTACTS_PAGE_SIZE, LIST_FETCH_SIZE, TIMELINE_PAGE_SIZE
+from app.core.contact_queries import (
+    TIMELINE_FILTERS,
+    ContactsPage,
+    InvalidCursorError,
+    TimelinePage,
+    contacts_page_statement,
+    contacts_page_url,
+    load_contact_detail,
+    load_timeline_page,
+)
+from app.core.contact_facets import facet_cache
+from app.core.contact_search import (
+    SearchGeneration,
+    search_generation,
+    search_generations,
+    search_result_cache,
+)
+from app.core.http_cache import (
+    CONTACT_PAGE_TABLES,
+    CONTACTS_LIST_TABLES,
+    data_versions,
+    not_modified,
+    page_etag,
+    with_etag,
+)
+from app.core.templates import stream_template, streaming_html, templates
+from app.db.session import ReadSessionLocal, get_db, get_read_db
+from app.db.upsert import insert_ignoring_conflicts
 from app.models import Activity, Company, Contact, Note
+from app.models.company import normalize_company_name
 from app.schemas.activity import ActivityFormSchema
 from app.schemas.contact import ContactFormSchema
 from app.schemas.note import NoteFormSchema
 
 router = APIRouter()
 
+# Bulk actions apply to the ticked contacts or to every contact matching the list filters
+_BULK_SCOPES = ("selected", "filter")
+
 
 def _get_contact_or_404(db: Session, contact_id: int) -> Contact | None:
     return db.get(Contact, contact_id)
 
 
-def _list_companies(db: Session) -> list[Company]:
-    return db.execute(select(Company).order_by(Company.name.asc())).scalars().all()
+def _selected_company(db: Session, company_id_raw: str | None) -> Company | None:
+    """Company to pre-fill in the typeahead picker when re-rendering a submitted form."""
+    try:
+        return db.get(Company, int(company_id_raw or ""))
+    except ValueError:
+        return None
+
+
+def _timeline_page(db: Session, contact_id: int, entry_filter: str, cursor: str) -> TimelinePage:
+    if entry_filter not in TIMELINE_FILTERS:
+        raise HTTPException(status_code=400, detail="Invalid timeline filter")
+    try:
+        return load_timeline_page(db, contact_id, entry_filter, cursor, TIMELINE_PAGE_SIZE)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 def _resolve_company_id(
@@ -46,22 +103,52 @@ def _resolve_company_id(
 def _resolve_or_create_company(
     db: Session,
     name: str | None,
-) -> tuple[Company | None, str | None]:
-    """Resolve company by name (case-insensitive) or create. Returns (Company, None) or (None, error)."""
-    normalized = (name or "").strip()
+) -> tuple[Company | None, bool, str | None]:
+    """Resolve company by normalized name or create it.
+
+    Returns (Company, created, None), where `created` is True when this call inserted the
+    company, or (None, False, error).
+
+    Lookup uses the unique name_normalized index; creation is INSERT ... ON CONFLICT DO NOTHING
+    followed by a re-read, so concurrent requests for the same new name share one company.
+    """
+    display_name = (name or "").strip()
+    normalized = normalize_company_name(display_name)
     if not normalized:
-        return None, "Company name is required"
-    existing = (
-        db.execute(select(Company).where(Company.name.ilike(normalized)).limit(1))
-        .scalars()
-        .first()
-    )
+        return None, False, "Company name is required"
+    lookup = select(Company).where(Company.name_normalized == normalized)
+    existing = db.execute(lookup).scalar_one_or_none()
     if existing is not None:
-        return existing, None
-    company = Company(name=normalized)
-    db.add(company)
-    db.flush()
-    return company, None
+        return existing, False, None
+    inserted = insert_ignoring_conflicts(
+        db,
+        Company,
+        [{"name": display_name, "name_normalized": normalized}],
+        index_elements=["name_normalized"],
+    )
+    if inserted:
+        bump_company_directory_version(db)
+    return db.execute(lookup).scalar_one(), bool(inserted), None
+
+
+def _stream_contacts_page(
+    template: str,
+    stmt: Select,
+    context: dict,
+    page_url: Callable[[str], str],
+    search: SearchGeneration | None,
+) -> Iterator[str]:
+    """Render a contacts list page while its rows are fetched (session owned by the stream).
+
+    A search-as-you-type page overtaken while it waited for a stream slot ends empty without
+    running its query; the client has dropped the request for the newer one.
+    """
+    if search is not None and not search_generations.is_current(search):
+        return
+    with ReadSessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=LIST_FETCH_SIZE))
+        contacts = ContactsPage(result, CONTACTS_PAGE_SIZE, page_url)
+        yield from stream_template(template, {**context, "contacts": contacts})
 
 
 @router.get("/contacts", response_class=HTMLResponse)
@@ -70,58 +157,96 @@ def list_contacts(
     q: str = Query(default=""),
     has_email: bool = Query(default=False),
     has_phone: bool = Query(default=False),
-    db: Session = Depends(get_db),
-) -> HTMLResponse:
-    stmt = select(Contact).options(selectinload(Contact.company_ref))
-
+    cursor: str = Query(default=""),
+    db: Session = Depends(get_read_db),
+) -> Response:
+    """Stream the list (or its HTMX fragment) while the page's rows are read from the cursor.
+
+    Search-as-you-type requests that a newer one has overtaken get a 204 without any query
+    (see app.core.contact_search). The request session checks the client's ETag (304 when
+    unchanged), then builds and validates the query, so a bad cursor is still a 400. Searches
+    (q) go through the search result cache and render in one piece.
+    """
+    search = search_generation(request)
+    if search is not None and not search_generations.begin(search):
+        return Response(status_code=204)
+    etag = page_etag(request, data_versions(db, CONTACTS_LIST_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
     q = q.strip()
-    if q:
-        search_value = f"%{q}%"
-        stmt = stmt.where(
-            or_(
-                Contact.full_name.ilike(search_value),
-                Contact.email.ilike(search_value),
-                Contact.company.ilike(search_value),
-            )
-        )
-
-    if has_email:
-        stmt = stmt.where(Contact.email.is_not(None), Contact.email != "")
+    cursor = cursor.strip()
 
-    if has_phone:
-        stmt = stmt.where(Contact.phone.is_not(None), Contact.phone != "")
-
-    contacts = (
-        db.execute(stmt.order_by(Contact.updated_at.desc()))
-        .scalars()
-        .all()
-    )
     context = {
         "request": request,
-        "contacts": contacts,
         "q": q,
         "has_email": has_email,
         "has_phone": has_phone,
     }
-
     if request.headers.get("HX-Request"):
-        return templates.TemplateResponse("contacts/_contacts_table.html", context)
+        template = "contacts/_contact_rows.html" if cursor else "contacts/_contacts_table.html"
+    else:
+        template = "contacts/list.html"
 
-    return templates.TemplateResponse("contacts/list.html", context)
+    def page_url(next_cursor: str) -> str:
+        return contacts_page_url(q, has_email, has_phone, next_cursor)
 
+    if q:
+        try:
+            rows = search_result_cache.page_rows(
+                db, q, has_email, has_phone, cursor, CONTACTS_PAGE_SIZE
+            )
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if search is not None and not search_generations.is_current(search):
+            return Response(status_code=204)
+        context["contacts"] = ContactsPage(rows, CONTACTS_PAGE_SIZE, page_url)
+        return with_etag(templates.TemplateResponse(template, context), etag)
 
-@router.get("/contacts/new", response_class=HTMLResponse)
-def new_contact(
+    try:
+        stmt = contacts_page_statement(
+            db, q, has_email, has_phone, cursor, limit=CONTACTS_PAGE_SIZE + 1
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    db.close()  # the stream reads with its own session (see app.core.templates)
+    return with_etag(
+        streaming_html(_stream_contacts_page(template, stmt, context, page_url, search)),
+        etag,
+    )
+
+
+@router.get("/contacts/facets", response_class=HTMLResponse)
+def contact_facets(
     request: Request,
-    db: Session = Depends(get_db),
-) -> HTMLResponse:
+    q: str = Query(default=""),
+    has_email: bool = Query(default=False),
+    has_phone: bool = Query(default=False),
+    db: Session = Depends(get_read_db),
+) -> Response:
+    """Totals for the filters card, loaded after the list so it never waits for the counts."""
+    etag = page_etag(request, data_versions(db, CONTACTS_LIST_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return with_etag(
+        templates.TemplateResponse(
+            "contacts/_facets.html",
+            {"request": request, "facets": facet_cache.get(db, q, has_email, has_phone)},
+        ),
+        etag,
+    )
+
+
+@router.get("/contacts/new", response_class=HTMLResponse)
+def new_contact(request: Request) -> HTMLResponse:
     return templates.TemplateResponse(
         "contacts/new.html",
         {
             "request": request,
             "contact": None,
             "errors": [],
-            "companies": _list_companies(db),
+            "selected_company": None,
         },
     )
 
@@ -156,13 +281,13 @@ def create_contact(
                 "form_phone": phone or "",
                 "form_company": company or "",
                 "form_company_id": company_id or "",
-                "companies": _list_companies(db),
+                "selected_company": _selected_company(db, company_id),
             },
             status_code=200,
         )
     company_text = (company or "").strip()
     if company_text:
-        resolved_company, resolve_error = _resolve_or_create_company(db, company_text)
+        resolved_company, _, resolve_error = _resolve_or_create_company(db, company_text)
         if resolve_error:
             return templates.TemplateResponse(
                 "contacts/new.html",
@@ -175,7 +300,7 @@ def create_contact(
                     "form_phone": phone or "",
                     "form_company": company or "",
                     "form_company_id": company_id or "",
-                    "companies": _list_companies(db),
+                    "selected_company": _selected_company(db, company_id),
                 },
                 status_code=200,
             )
@@ -195,7 +320,7 @@ def create_contact(
                     "form_phone": phone or "",
                     "form_company": company or "",
                     "form_company_id": company_id or "",
-                    "companies": _list_companies(db),
+                    "selected_company": _selected_company(db, company_id),
                 },
                 status_code=200,
             )
@@ -216,49 +341,88 @@ def create_contact(
     return RedirectResponse(url="/contacts", status_code=303)
 
 
-@router.get("/contacts/{contact_id:int}/edit", response_class=HTMLResponse)
-def edit_contact(
+def _render_edit_contact_errors(
     request: Request,
+    db: Session,
     contact_id: int,
-    db: Session = Depends(get_db),
-) -> HTMLResponse:
-    contact = (
-        db.execute(
-            select(Contact)
-            .where(Contact.id == contact_id)
-            .options(selectinload(Contact.company_ref))
-        )
-        .unique()
-        .scalar_one_or_none()
-    )
-    if contact is None:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    notes = (
-        db.execute(
-            select(Note).where(Note.contact_id == contact_id).order_by(Note.created_at.desc())
-        )
-        .scalars()
-        .all()
-    )
-    activities = (
-        db.execute(
-            select(Activity)
-            .where(Activity.contact_id == contact_id)
-            .order_by(Activity.activity_date.desc())
-        )
-        .scalars()
-        .all()
-    )
+    errors: list[str],
+    form: dict[str, str],
+) -> Response:
+    """Re-render the edit page with validation errors and the submitted form values."""
+    contact = load_contact_detail(db, contact_id)
     return templates.TemplateResponse(
         "contacts/edit.html",
         {
             "request": request,
             "contact": contact,
-            "notes": notes,
-            "activities": activities,
-            "errors": [],
-            "companies": _list_companies(db),
+            "timeline": _timeline_page(db, contact_id, "", ""),
+            "timeline_filter": "",
+            "timeline_filters": TIMELINE_FILTERS,
+            "errors": errors,
+            **form,
+            "selected_company": _selected_company(db, form["form_company_id"])
+            or contact.company_ref,
         },
+        status_code=200,
+    )
+
+
+@router.get("/contacts/{contact_id:int}/edit", response_class=HTMLResponse)
+def edit_contact(
+    request: Request,
+    contact_id: int,
+    type: str = Query(default=""),
+    db: Session = Depends(get_read_db),
+) -> Response:
+    etag = page_etag(request, data_versions(db, CONTACT_PAGE_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    contact = load_contact_detail(db, contact_id)
+    if contact is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return with_etag(
+        templates.TemplateResponse(
+            "contacts/edit.html",
+            {
+                "request": request,
+                "contact": contact,
+                "timeline": _timeline_page(db, contact_id, type, ""),
+                "timeline_filter": type,
+                "timeline_filters": TIMELINE_FILTERS,
+                "errors": [],
+                "selected_company": contact.company_ref,
+            },
+        ),
+        etag,
+    )
+
+
+@router.get("/contacts/{contact_id:int}/timeline", response_class=HTMLResponse)
+def contact_timeline(
+    request: Request,
+    contact_id: int,
+    type: str = Query(default=""),
+    cursor: str = Query(default=""),
+    db: Session = Depends(get_read_db),
+) -> Response:
+    """A page of the contact's notes and activities, newest first, for the edit page's timeline:
+    the first page when a filter is picked, older entries when "Load older" comes into view."""
+    etag = page_etag(request, data_versions(db, CONTACT_PAGE_TABLES))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    if _get_contact_or_404(db, contact_id) is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return with_etag(
+        templates.TemplateResponse(
+            "contacts/_timeline_page.html",
+            {
+                "request": request,
+                "timeline": _timeline_page(db, contact_id, type, cursor.strip()),
+            },
+        ),
+        etag,
     )
 
 
@@ -276,6 +440,13 @@ def update_contact(
     contact = _get_contact_or_404(db, contact_id)
     if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    form = {
+        "form_full_name": full_name,
+        "form_email": email or "",
+        "form_phone": phone or "",
+        "form_company": company or "",
+        "form_company_id": company_id or "",
+    }
     try:
         data = ContactFormSchema(
             full_name=full_name.strip(),
@@ -285,114 +456,18 @@ def update_contact(
         )
     except ValidationError as e:
         errors = [err["msg"] for err in e.errors()]
-        notes = (
-            db.execute(
-                select(Note).where(Note.contact_id == contact_id).order_by(Note.created_at.desc())
-            )
-            .scalars()
-            .all()
-        )
-        activities = (
-            db.execute(
-                select(Activity)
-                .where(Activity.contact_id == contact_id)
-                .order_by(Activity.activity_date.desc())
-            )
-            .scalars()
-            .all()
-        )
-        return templates.TemplateResponse(
-            "contacts/edit.html",
-            {
-                "request": request,
-                "contact": contact,
-                "notes": notes,
-                "activities": activities,
-                "errors": errors,
-                "form_full_name": full_name,
-                "form_email": email or "",
-                "form_phone": phone or "",
-                "form_company": company or "",
-                "form_company_id": company_id or "",
-                "companies": _list_companies(db),
-            },
-            status_code=200,
-        )
+        return _render_edit_contact_errors(request, db, contact_id, errors, form)
     company_text = (company or "").strip()
     if company_text:
-        resolved_company, resolve_error = _resolve_or_create_company(db, company_text)
+        resolved_company, _, resolve_error = _resolve_or_create_company(db, company_text)
         if resolve_error:
-            notes = (
-                db.execute(
-                    select(Note).where(Note.contact_id == contact_id).order_by(Note.created_at.desc())
-                )
-                .scalars()
-                .all()
-            )
-            activities = (
-                db.execute(
-                    select(Activity)
-                    .where(Activity.contact_id == contact_id)
-                    .order_by(Activity.activity_date.desc())
-                )
-                .scalars()
-                .all()
-            )
-            return templates.TemplateResponse(
-                "contacts/edit.html",
-                {
-                    "request": request,
-                    "contact": contact,
-                    "notes": notes,
-                    "activities": activities,
-                    "errors": [resolve_error],
-                    "form_full_name": full_name,
-                    "form_email": email or "",
-                    "form_phone": phone or "",
-                    "form_company": company or "",
-                    "form_company_id": company_id or "",
-                    "companies": _list_companies(db),
-                },
-                status_code=200,
-            )
+            return _render_edit_contact_errors(request, db, contact_id, [resolve_error], form)
         selected_company_id = resolved_company.id
         company_display_name = resolved_company.name
     else:
         selected_company_id, company_id_error = _resolve_company_id(db, company_id)
         if company_id_error:
-            notes = (
-                db.execute(
-                    select(Note).where(Note.contact_id == contact_id).order_by(Note.created_at.desc())
-                )
-                .scalars()
-                .all()
-            )
-            activities = (
-                db.execute(
-                    select(Activity)
-                    .where(Activity.contact_id == contact_id)
-                    .order_by(Activity.activity_date.desc())
-                )
-                .scalars()
-                .all()
-            )
-            return templates.TemplateResponse(
-                "contacts/edit.html",
-                {
-                    "request": request,
-                    "contact": contact,
-                    "notes": notes,
-                    "activities": activities,
-                    "errors": [company_id_error],
-                    "form_full_name": full_name,
-                    "form_email": email or "",
-                    "form_phone": phone or "",
-                    "form_company": company or "",
-                    "form_company_id": company_id or "",
-                    "companies": _list_companies(db),
-                },
-                status_code=200,
-            )
+            return _render_edit_contact_errors(request, db, contact_id, [company_id_error], form)
         company_display_name = None
         if selected_company_id is not None:
             c = db.get(Company, selected_company_id)
@@ -532,3 +607,99 @@ def delete_contact(
     db.delete(contact)
     db.commit()
     return HTMLResponse(content="", status_code=200)
+
+
+def _render_bulk_result(
+    request: Request,
+    db: Session,
+    filters: BulkTarget,
+    result: BulkResult | None,
+    errors: list[str],
+) -> Response:
+    """The contacts table for the current filters after a bulk action, with its outcome.
+
+    The contacts-changed event (HX-Trigger, with the counts) refreshes the facets.
+    """
+    q, has_email, has_phone = filters.q, filters.has_email, filters.has_phone
+    rows = db.execute(
+        contacts_page_statement(db, q, has_email, has_phone, "", limit=CONTACTS_PAGE_SIZE + 1)
+    ).all()
+    context = {
+        "request": request,
+        "q": q,
+        "has_email": has_email,
+        "has_phone": has_phone,
+        "contacts": ContactsPage(
+            rows,
+            CONTACTS_PAGE_SIZE,
+            lambda cursor: contacts_page_url(q, has_email, has_phone, cursor),
+        ),
+        "bulk_result": result,
+        "errors": errors,
+    }
+    if request.headers.get("HX-Request"):
+        template = "contacts/_bulk_response.html"
+    else:
+        template = "contacts/list.html"
+    response = templates.TemplateResponse(template, context)
+    if result is not None:
+        response.headers["HX-Trigger"] = json.dumps({"contacts-changed": asdict(result)})
+    return response
+
+
+@router.post("/contacts/bulk", response_class=HTMLResponse)
+def bulk_contacts(
+    request: Request,
+    db: Session = Depends(get_db),
+    action: str = Form(""),
+    scope: str = Form("selected"),
+    ids: list[str] = Form(default=[]),
+    q: str = Form(""),
+    has_email: bool = Form(False),
+    has_phone: bool = Form(False),
+    company: str | None = Form(None),
+    company_id: str | None = Form(None),
+) -> Response:
+    """Delete, move to a company or link the company text of many contacts in one transaction.
+
+    `ids` (repeated and/or comma-separated) select the contacts for scope=selected; scope=filter
+    takes every contact matching q / has_email / has_phone, and refuses to delete when none of
+    them is set (that would be every contact). reassign uses the company named in `company`
+    (created if needed) or the existing `company_id`, like the contact form.
+    """
+    if action not in BULK_ACTIONS:
+        raise HTTPException(status_code=400, detail="Invalid bulk action")
+    if scope not in _BULK_SCOPES:
+        raise HTTPException(status_code=400, detail="Invalid bulk scope")
+    filters = BulkTarget(q=q.strip(), has_email=has_email, has_phone=has_phone)
+    target = filters
+    if scope == "selected":
+        try:
+            target = BulkTarget(ids=parse_contact_ids(ids))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid contact id")
+        if not target.ids:
+            return _render_bulk_result(request, db, filters, None, ["Select at least one contact"])
+    elif action == "delete" and not (filters.q or has_email or has_phone):
+        errors = ["Search or filter the contacts before deleting all matches"]
+        return _render_bulk_result(request, db, filters, None, errors)
+
+    if action == "delete":
+        result = delete_contacts(db, target)
+    elif action == "reassign":
+        company_text = (company or "").strip()
+        company_created = False
+        if company_text:
+            selected_company, company_created, error = _resolve_or_create_company(db, company_text)
+        else:
+            selected_company_id, error = _resolve_company_id(db, company_id)
+            selected_company = db.get(Company, selected_company_id) if selected_company_id else None
+            if error is None and selected_company is None:
+                error = "Choose the company to move the contacts to"
+        if error:
+            return _render_bulk_result(request, db, filters, None, [error])
+        result = reassign_company(db, target, selected_company, company_created)
+    else:
+        result = link_legacy_companies(db, target)
+    db.commit()
+    return _render_bulk_result(request, db, filters, result, [])
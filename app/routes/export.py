@@ -0,0 +1,129 @@
+"""Streaming CSV/JSONL exports of contacts, notes and activities.
+
+Rows are read with a `yield_per` cursor and written chunk by chunk, so memory stays flat
+however large the tables are, and each export runs in a stream slot (see app.core.templates).
+The contacts list filters (q, has_email, has_phone) select which contacts, and whose notes
+and activities, are exported.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app.core.config import EXPORT_CHUNK_SIZE
+from app.core.contact_filters import contact_filter_conditions
+from app.core.templates import streaming_response
+from app.db.session import ReadSessionLocal
+from app.models import Activity, Company, Contact, Note
+
+router = APIRouter()
+
+_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def _contacts_export() -> Select:
+    return (
+        select(
+            Contact.id,
+            Contact.full_name,
+            Contact.email,
+            Contact.phone,
+            Contact.company,
+            Contact.company_id,
+            Company.name.label("company_name"),
+            Contact.created_at,
+            Contact.updated_at,
+        )
+        .outerjoin(Company, Company.id == Contact.company_id)
+        .order_by(Contact.id)
+    )
+
+
+def _notes_export() -> Select:
+    return (
+        select(Note.id, Note.contact_id, Note.content, Note.created_at, Note.updated_at)
+        .join(Contact, Contact.id == Note.contact_id)
+        .order_by(Note.id)
+    )
+
+
+def _activities_export() -> Select:
+    return (
+        select(
+            Activity.id,
+            Activity.contact_id,
+            Activity.type,
+            Activity.description,
+            Activity.activity_date,
+            Activity.created_at,
+            Activity.updated_at,
+        )
+        .join(Contact, Contact.id == Activity.contact_id)
+        .order_by(Activity.id)
+    )
+
+
+_DATASETS = {
+    "contacts": _contacts_export,
+    "notes": _notes_export,
+    "activities": _activities_export,
+}
+
+
+def _export_value(value: object) -> object:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _stream_rows(dataset: str, fmt: str, q: str, has_email: bool, has_phone: bool) -> Iterator[str]:
+    """Yield the export as text chunks of up to EXPORT_CHUNK_SIZE rows.
+
+    The session lives inside the generator: it is opened when the response starts streaming
+    and closed when the last chunk has been produced (or the client disconnects).
+    """
+    with ReadSessionLocal() as db:
+        stmt = _DATASETS[dataset]().where(*contact_filter_conditions(db, q, has_email, has_phone))
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        columns = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(columns)
+        for partition in result.partitions():
+            for row in partition:
+                values = [_export_value(value) for value in row]
+                if writer is not None:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values))) + "\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+@router.get("/export/{dataset}.{fmt}")
+def export_dataset(
+    dataset: str,
+    fmt: str,
+    q: str = Query(default=""),
+    has_email: bool = Query(default=False),
+    has_phone: bool = Query(default=False),
+) -> StreamingResponse:
+    """Stream /export/{contacts,notes,activities}.{csv,jsonl} for the filtered contacts."""
+    if dataset not in _DATASETS or fmt not in _MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return streaming_response(
+        _stream_rows(dataset, fmt, q, has_email, has_phone),
+        _MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{fmt}"'},
+    )
@@ -1,11 +1,22 @@
-"""Health check endpoint."""
+"""Health check endpoints: liveness (/health) and database readiness (/health/ready)."""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.db.health import readiness_cache
+from app.db.session import engine, read_engine
 
 router = APIRouter()
 
 
 @router.get("/health")
 def health() -> dict[str, str]:
-    """Return service status for monitoring and readiness checks."""
+    """Liveness: the process is up and serving requests (does not touch the database)."""
     return {"status": "ok"}
+
+
+@router.get("/health/ready")
+def health_ready() -> JSONResponse:
+    """Database latency, migration state, pool and WAL stats; 503 unless the database is usable."""
+    report = readiness_cache.get(engine, read_engine)
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
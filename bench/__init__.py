@@ -0,0 +1 @@
+"""Benchmarks for the CRM routes. Not imported by the application; run the modules with `python -m bench.<module>`."""
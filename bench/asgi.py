@@ -0,0 +1,134 @@
+"""Minimal in-process ASGI client: drive the application without a server or a socket.
+
+Requests go straight through the middleware stack, routing, dependencies, the threadpool and
+template rendering, so a benchmark measures the application rather than HTTP parsing or the
+loopback network. Only what the benchmarks need is supported: one request body (for example an
+urlencoded form) and a response body read to the end, streamed or not.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from urllib.parse import urlencode, urlsplit
+
+from starlette.types import ASGIApp, Message
+
+
+@dataclass
+class ASGIResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+
+    def header(self, name: str) -> str | None:
+        key = name.lower().encode("latin-1")
+        for header_name, value in self.headers:
+            if header_name.lower() == key:
+                return value.decode("latin-1")
+        return None
+
+
+class ASGIClient:
+    """Send HTTP requests to an ASGI application in the current event loop."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator["ASGIClient"]:
+        """Run the application's startup handlers on entry and its shutdown handlers on exit."""
+        startup_done = asyncio.Event()
+        shutdown_requested = asyncio.Event()
+        failure: list[str] = []
+        sent_startup = False
+
+        async def receive() -> Message:
+            nonlocal sent_startup
+            if not sent_startup:
+                sent_startup = True
+                return {"type": "lifespan.startup"}
+            await shutdown_requested.wait()
+            return {"type": "lifespan.shutdown"}
+
+        async def send(message: Message) -> None:
+            if message["type"] in ("lifespan.startup.complete", "lifespan.startup.failed"):
+                if message["type"] == "lifespan.startup.failed":
+                    failure.append(message.get("message", ""))
+                startup_done.set()
+
+        task = asyncio.create_task(
+            self.app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, receive, send)
+        )
+        await startup_done.wait()
+        if failure:
+            await task
+            raise RuntimeError(f"application startup failed: {failure[0]}")
+        try:
+            yield self
+        finally:
+            shutdown_requested.set()
+            await task
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        form: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> ASGIResponse:
+        parts = urlsplit(url)
+        body = urlencode(form).encode() if form is not None else b""
+        request_headers = [(b"host", b"testserver")]
+        if form is not None:
+            request_headers += [
+                (b"content-type", b"application/x-www-form-urlencoded"),
+                (b"content-length", str(len(body)).encode()),
+            ]
+        for name, value in (headers or {}).items():
+            request_headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": request_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        response = ASGIResponse(status=0)
+        chunks: list[bytes] = []
+        response_complete = asyncio.Event()
+        body_sent = False
+
+        async def receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Streaming responses listen for a disconnect while they send; only report one
+            # once the whole response has been received.
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response.status = message["status"]
+                response.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_complete.set()
+        response.body = b"".join(chunks)
+        return response
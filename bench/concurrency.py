@@ -0,0 +1,132 @@
+"""Closed-loop concurrency benchmark against a running server: requests/sec and latency percentiles.
+
+Each of `--concurrency` clients keeps one HTTP/1.1 keep-alive connection and sends requests
+back to back for `--duration` seconds, cycling through `--path` values. Compare the sync and
+async stacks by starting the server twice on the same database:
+
+    DB_ASYNC=false uvicorn app.main:app --port 8000
+    DB_ASYNC=true uvicorn app.main:app --port 8000
+    python -m bench.concurrency --url http://127.0.0.1:8000 --concurrency 200 --path /contacts
+
+Prints a JSON report. Uses only the standard library, so it measures the server rather than
+an HTTP client library.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    """Mean, p50/p90/p99 and max of ascending latencies in seconds, reported in milliseconds."""
+    return {
+        "mean": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50": round(percentile(latencies, 0.50) * 1000, 2),
+        "p90": round(percentile(latencies, 0.90) * 1000, 2),
+        "p99": round(percentile(latencies, 0.99) * 1000, 2),
+        "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    """Read one HTTP/1.1 response (Content-Length or chunked body); return the status code."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by server")
+    status = int(status_line.split()[1])
+    headers: dict[str, str] = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", "0")))
+    return status
+
+
+async def _client(
+    host: str,
+    port: int,
+    paths: "itertools.cycle[str]",
+    deadline: float,
+    latencies: list[float],
+    errors: list[str],
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            request = f"GET {next(paths)} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(f"HTTP {status}")
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+        errors.append(f"{type(e).__name__}: {e}")
+    finally:
+        writer.close()
+
+
+async def run(url: str, paths: list[str], concurrency: int, duration: float) -> dict:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    path_cycle = itertools.cycle(paths)
+    latencies: list[float] = []
+    errors: list[str] = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(_client(host, port, path_cycle, deadline, latencies, errors) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "url": url,
+        "paths": paths,
+        "concurrency": concurrency,
+        "duration_seconds": round(elapsed, 2),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.concurrency")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL")
+    parser.add_argument(
+        "--path",
+        action="append",
+        dest="paths",
+        help="Request path, repeatable (requests cycle through them). Default: /contacts",
+    )
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds")
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args.url, args.paths or ["/contacts"], args.concurrency, args.duration))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""In-process benchmark of the CRM routes: throughput and latency percentiles per scenario.
+
+    python -m bench.seed --database bench.db
+    python -m bench.routes --database bench.db --requests 2000 --concurrency 8 --output report.json
+
+Each scenario sends `--requests` requests (after `--warmup` unmeasured ones) from
+`--concurrency` concurrent clients through `bench.asgi.ASGIClient`, so the numbers cover the
+whole application (middleware, dependencies, threadpool, SQL, templates) but no HTTP server.
+Contacts are picked with the same skew the seeder used, so hot contacts with long note and
+activity histories come up as often as they would in real use.
+
+The JSON report records the commit, Python/SQLite versions and row counts next to the
+results, so reports from two commits can be compared directly. The write scenarios add rows:
+re-seed (same `--seed`) before each run that is meant to be compared.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from bench.asgi import ASGIClient
+from bench.concurrency import latency_summary
+from bench.seed import LAST_NAMES, NOTE_PHRASES, SEED_EPOCH, skewed_id
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class BenchRequest:
+    method: str
+    url: str
+    form: dict[str, str] | None = None
+    headers: dict[str, str] | None = None
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """What the scenarios need to know about the seeded database."""
+
+    contacts: int
+    companies: int
+    skew: float
+
+    def contact_id(self, rng: random.Random) -> int:
+        return skewed_id(rng, self.contacts, self.skew)
+
+    def company_id(self, rng: random.Random) -> int:
+        return skewed_id(rng, self.companies, self.skew)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[random.Random, Dataset], BenchRequest]
+    expected_status: int = 200
+    needs_contacts: bool = False
+
+
+def _create_contact(rng: random.Random, data: Dataset) -> BenchRequest:
+    form = {
+        "full_name": f"Bench {rng.choice(LAST_NAMES)}",
+        "email": f"bench{rng.randrange(10**9)}@example.com",
+        "phone": f"+1 555 {rng.randrange(10_000_000):07d}",
+        "company": "",
+        "company_id": str(data.company_id(rng)) if data.companies else "",
+    }
+    return BenchRequest("POST", "/contacts", form=form)
+
+
+def _create_note(rng: random.Random, data: Dataset) -> BenchRequest:
+    return BenchRequest(
+        "POST",
+        f"/contacts/{data.contact_id(rng)}/notes",
+        form={"content": rng.choice(NOTE_PHRASES)},
+        headers={"HX-Request": "true"},
+    )
+
+
+def _create_activity(rng: random.Random, data: Dataset) -> BenchRequest:
+    return BenchRequest(
+        "POST",
+        f"/contacts/{data.contact_id(rng)}/activities",
+        form={
+            "type": rng.choice(("call", "email", "meeting", "task")),
+            "description": rng.choice(NOTE_PHRASES),
+            "activity_date": SEED_EPOCH.strftime("%Y-%m-%dT%H:%M"),
+        },
+        headers={"HX-Request": "true"},
+    )
+
+
+# Read scenarios first: the write scenarios change the data the reads would see.
+SCENARIOS: tuple[Scenario, ...] = (
+    Scenario("list_contacts", lambda rng, data: BenchRequest("GET", "/contacts")),
+    Scenario(
+        "list_contacts_q",
+        lambda rng, data: BenchRequest("GET", f"/contacts?q={rng.choice(LAST_NAMES)}"),
+    ),
+    Scenario(
+        "list_contacts_has_email",
+        lambda rng, data: BenchRequest("GET", "/contacts?has_email=true"),
+    ),
+    Scenario(
+        "list_contacts_has_phone",
+        lambda rng, data: BenchRequest("GET", "/contacts?has_phone=true"),
+    ),
+    Scenario(
+        "list_contacts_q_has_email_has_phone",
+        lambda rng, data: BenchRequest(
+            "GET", f"/contacts?q={rng.choice(LAST_NAMES)}&has_email=true&has_phone=true"
+        ),
+    ),
+    Scenario(
+        "edit_contact",
+        lambda rng, data: BenchRequest("GET", f"/contacts/{data.contact_id(rng)}/edit"),
+        needs_contacts=True,
+    ),
+    Scenario("create_contact", _create_contact, expected_status=303),
+    Scenario("create_note", _create_note, needs_contacts=True),
+    Scenario("create_activity", _create_activity, needs_contacts=True),
+)
+SCENARIO_NAMES = tuple(scenario.name for scenario in SCENARIOS)
+
+
+async def run_scenario(
+    client: ASGIClient,
+    scenario: Scenario,
+    data: Dataset,
+    rng: random.Random,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict:
+    """Send `requests` measured requests from `concurrency` workers; summarize the latencies."""
+    for _ in range(warmup):
+        await _send(client, scenario.build(rng, data))
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            request = scenario.build(rng, data)
+            started = time.perf_counter()
+            try:
+                status = await _send(client, request)
+            except Exception as e:  # noqa: BLE001 - an error is a result to report, not a crash
+                errors.append(f"{request.method} {request.url}: {type(e).__name__}: {e}")
+                continue
+            latencies.append(time.perf_counter() - started)
+            if status != scenario.expected_status:
+                errors.append(f"{request.method} {request.url}: HTTP {status}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "duration_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+async def _send(client: ASGIClient, request: BenchRequest) -> int:
+    response = await client.request(
+        request.method, request.url, form=request.form, headers=request.headers
+    )
+    return response.status
+
+
+def _row_counts(database: Path) -> dict[str, int]:
+    with sqlite3.connect(f"file:{database}?mode=ro", uri=True) as connection:
+        return {
+            table: connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            for table in ("companies", "contacts", "notes", "activities")
+        }
+
+
+def _max_id(database: Path, table: str) -> int:
+    with sqlite3.connect(f"file:{database}?mode=ro", uri=True) as connection:
+        return connection.execute(f"SELECT coalesce(max(id), 0) FROM {table}").fetchone()[0]
+
+
+def _git_revision() -> str | None:
+    try:
+        revision = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=_REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision.stdout.strip() or None
+
+
+async def run(
+    database: Path,
+    scenario_names: list[str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    skew: float,
+    random_seed: int,
+) -> dict:
+    # The application reads its configuration at import time
+    os.environ["DATABASE_URL"] = f"sqlite:///{database.resolve()}"
+    from app.core import config
+    from app.main import app
+
+    rows_before = _row_counts(database)
+    data = Dataset(
+        contacts=_max_id(database, "contacts"),
+        companies=_max_id(database, "companies"),
+        skew=skew,
+    )
+    rng = random.Random(random_seed)
+    client = ASGIClient(app)
+    results: dict[str, dict] = {}
+    async with client.lifespan():
+        for scenario in SCENARIOS:
+            if scenario.name not in scenario_names:
+                continue
+            if scenario.needs_contacts and not data.contacts:
+                results[scenario.name] = {"skipped": "the database has no contacts"}
+                continue
+            print(f"  {scenario.name}...", file=sys.stderr)
+            results[scenario.name] = await run_scenario(
+                client, scenario, data, rng, requests, concurrency, warmup
+            )
+
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "database": str(database),
+        "rows": rows_before,
+        "settings": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "skew": skew,
+            "seed": random_seed,
+            "db_async": config.DB_ASYNC,
+            "contacts_page_size": config.CONTACTS_PAGE_SIZE,
+        },
+        "scenarios": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.routes")
+    parser.add_argument("--database", type=Path, default=Path("bench.db"), help="Seeded SQLite file")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        choices=SCENARIO_NAMES,
+        help="Scenario to run, repeatable. Default: all",
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument(
+        "--skew", type=float, default=3.0, help="Contact/company pick skew (use the seeding value)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for request parameters")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not args.database.exists():
+        parser.error(f"{args.database} does not exist; create it with python -m bench.seed")
+    report = asyncio.run(
+        run(
+            args.database,
+            args.scenarios or list(SCENARIO_NAMES),
+            args.requests,
+            args.concurrency,
+            args.warmup,
+            args.skew,
+            args.seed,
+        )
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Seed a SQLite database with synthetic CRM data for benchmarking.
+
+    python -m bench.seed --database bench.db --contacts 1000000 --companies 100000 \\
+        --notes 10000000 --activities 10000000
+
+The schema is created with `alembic upgrade head`, so the database has exactly the production
+indexes, FTS table and triggers. Rows are then bulk-inserted with the sqlite3 module (the FTS
+triggers fire as they would for the application's own inserts).
+
+The data is skewed the way a real CRM is: a few companies employ most contacts, and a few
+contacts carry most of the notes and activities. `--skew` sets how strongly (1.0 is uniform).
+The same `--seed` always produces the same database, so two commits can be benchmarked on
+identical data.
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+INSERT_BATCH_SIZE = 50_000
+
+# Seeded timestamps fall in the SEED_HISTORY_DAYS before this fixed point (not "now", so that
+# a given seed always produces the same rows).
+SEED_EPOCH = datetime(2025, 1, 1)
+SEED_HISTORY_DAYS = 3 * 365
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David",
+    "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+    "Charles", "Karen", "Wei", "Priya", "Ahmed", "Sofia", "Lucas", "Yuki", "Olga", "Mateo",
+    "Amara", "Noah", "Fatima", "Liam", "Chloe", "Ivan", "Aisha", "Hugo", "Ingrid", "Kofi",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+    "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore",
+    "Jackson", "Martin", "Lee", "Chen", "Patel", "Kim", "Nguyen", "Schmidt", "Rossi", "Dubois",
+    "Kowalski", "Novak", "Silva", "Okafor", "Tanaka", "Ivanova", "Haddad", "Larsen", "Murphy",
+)
+COMPANY_WORDS = (
+    "North", "Blue", "Summit", "Pioneer", "Harbor", "Atlas", "Cedar", "Granite", "Silver",
+    "Bright", "Iron", "Maple", "Vertex", "Crescent", "Falcon", "Evergreen", "Orbit", "Delta",
+)
+COMPANY_SUFFIXES = (
+    "Logistics", "Labs", "Partners", "Systems", "Foods", "Capital", "Health", "Energy",
+    "Media", "Works", "Software", "Consulting", "Holdings", "Retail", "Design", "Freight",
+)
+EMAIL_DOMAINS = ("example.com", "example.org", "mail.example", "corp.example")
+NOTE_PHRASES = (
+    "Followed up on the proposal.", "Asked for updated pricing.", "Prefers email over calls.",
+    "Budget approved for next quarter.", "Introduced us to their procurement team.",
+    "Needs a demo of the reporting features.", "Renewal is due in the spring.",
+    "Concerned about onboarding time.", "Wants references from similar customers.",
+    "Out of office until next week.",
+)
+# (type, weight): calls and emails dominate a sales log
+ACTIVITY_TYPES = (("call", 4), ("email", 5), ("meeting", 2), ("task", 1))
+
+# Share of contacts with each optional field set
+EMAIL_RATE = 0.85
+PHONE_RATE = 0.6
+COMPANY_RATE = 0.9
+
+
+def skewed_id(rng: random.Random, count: int, skew: float) -> int:
+    """An id in 1..count, biased towards low ids: P(id <= k) = (k / count) ** (1 / skew)."""
+    return int(count * rng.random() ** skew) + 1
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return SEED_EPOCH - timedelta(seconds=rng.randrange(SEED_HISTORY_DAYS * 86400))
+
+
+def _sql_datetime(value: datetime) -> str:
+    # The text form SQLAlchemy's SQLite DateTime type stores
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _company_rows(rng: random.Random, count: int) -> Iterator[tuple]:
+    for company_id in range(1, count + 1):
+        name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {company_id}"
+        created = _timestamp(rng)
+        yield (company_id, name, name.lower(), _sql_datetime(created), _sql_datetime(created))
+
+
+def _contact_rows(
+    rng: random.Random, count: int, company_names: list[str], skew: float
+) -> Iterator[tuple]:
+    for contact_id in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = None
+        if rng.random() < EMAIL_RATE:
+            email = f"{first}.{last}{contact_id}@{rng.choice(EMAIL_DOMAINS)}".lower()
+        phone = None
+        if rng.random() < PHONE_RATE:
+            phone = f"+1 555 {rng.randrange(10_000_000):07d}"
+        company_id = None
+        company = None
+        if company_names and rng.random() < COMPANY_RATE:
+            company_id = skewed_id(rng, len(company_names), skew)
+            company = company_names[company_id - 1]
+        created = _timestamp(rng)
+        updated = min(SEED_EPOCH, created + timedelta(seconds=rng.randrange(365 * 86400)))
+        yield (
+            contact_id,
+            f"{first} {last}",
+            email,
+            phone,
+            company,
+            company_id,
+            _sql_datetime(created),
+            _sql_datetime(updated),
+        )
+
+
+def _note_rows(rng: random.Random, count: int, contacts: int, skew: float) -> Iterator[tuple]:
+    for _ in range(count):
+        created = _sql_datetime(_timestamp(rng))
+        content = " ".join(rng.sample(NOTE_PHRASES, rng.randint(1, 3)))
+        yield (skewed_id(rng, contacts, skew), content, created, created)
+
+
+def _activity_rows(rng: random.Random, count: int, contacts: int, skew: float) -> Iterator[tuple]:
+    types = [activity_type for activity_type, _ in ACTIVITY_TYPES]
+    weights = [weight for _, weight in ACTIVITY_TYPES]
+    for _ in range(count):
+        activity_date = _timestamp(rng)
+        created = _sql_datetime(activity_date)
+        activity_type = rng.choices(types, weights)[0]
+        yield (
+            skewed_id(rng, contacts, skew),
+            activity_type,
+            f"{activity_type.capitalize()}: {rng.choice(NOTE_PHRASES)}",
+            _sql_datetime(activity_date),
+            created,
+            created,
+        )
+
+
+def _insert(
+    connection: sqlite3.Connection, sql: str, rows: Iterator[tuple], label: str, total: int
+) -> None:
+    started = time.perf_counter()
+    inserted = 0
+    while True:
+        batch = [row for _, row in zip(range(INSERT_BATCH_SIZE), rows)]
+        if not batch:
+            break
+        connection.executemany(sql, batch)
+        connection.commit()
+        inserted += len(batch)
+        print(f"  {label}: {inserted}/{total}", file=sys.stderr, end="\r")
+    print(
+        f"  {label}: {inserted} rows in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+
+
+def create_schema(database: Path) -> None:
+    """Create the schema at the Alembic head revision."""
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database.resolve()}"}
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=_REPO_ROOT,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def seed(
+    database: Path,
+    contacts: int,
+    companies: int,
+    notes: int,
+    activities: int,
+    skew: float,
+    random_seed: int,
+) -> dict:
+    """Create and fill `database` (which must not exist yet). Returns a summary of what was seeded."""
+    started = time.perf_counter()
+    create_schema(database)
+    rng = random.Random(random_seed)
+    connection = sqlite3.connect(database)
+    try:
+        # Bulk-load settings for this connection only: a crash mid-seed just means re-seeding.
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA cache_size = -262144")
+
+        company_rows = list(_company_rows(rng, companies))
+        _insert(
+            connection,
+            "INSERT INTO companies (id, name, name_normalized, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            iter(company_rows),
+            "companies",
+            companies,
+        )
+        company_names = [row[1] for row in company_rows]
+        del company_rows
+
+        _insert(
+            connection,
+            "INSERT INTO contacts"
+            " (id, full_name, email, phone, company, company_id, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            _contact_rows(rng, contacts, company_names, skew),
+            "contacts",
+            contacts,
+        )
+        if contacts:
+            _insert(
+                connection,
+                "INSERT INTO notes (contact_id, content, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                _note_rows(rng, notes, contacts, skew),
+                "notes",
+                notes,
+            )
+            _insert(
+                connection,
+                "INSERT INTO activities"
+                " (contact_id, type, description, activity_date, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                _activity_rows(rng, activities, contacts, skew),
+                "activities",
+                activities,
+            )
+
+        connection.execute("ANALYZE")
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        counts = {
+            table: connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            for table in ("companies", "contacts", "notes", "activities")
+        }
+    finally:
+        connection.close()
+    return {
+        "database": str(database),
+        "seed": random_seed,
+        "skew": skew,
+        "rows": counts,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.seed")
+    parser.add_argument("--database", type=Path, default=Path("bench.db"), help="SQLite file")
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--companies", type=int, default=10_000)
+    parser.add_argument("--notes", type=int, default=1_000_000)
+    parser.add_argument("--activities", type=int, default=1_000_000)
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=3.0,
+        help="Concentration of contacts per company and notes/activities per contact (1.0 = uniform)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--force", action="store_true", help="Replace an existing database")
+    args = parser.parse_args(argv)
+
+    if args.skew < 1.0:
+        parser.error("--skew must be at least 1.0")
+    if args.database.exists():
+        if not args.force:
+            parser.error(f"{args.database} exists; pass --force to replace it")
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{args.database}{suffix}").unlink(missing_ok=True)
+
+    summary = seed(
+        args.database,
+        args.contacts,
+        args.companies,
+        args.notes,
+        args.activities,
+        args.skew,
+        args.seed,
+    )
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
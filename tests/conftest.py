@@ -0,0 +1,45 @@
+"""Shared fixtures: a throwaway SQLite file database migrated to head, and a TestClient on it.
+
+The environment is set at import time because app.core.config reads it when the app is first
+imported (load_dotenv does not override variables that are already set).
+"""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+_DB_DIR = tempfile.mkdtemp(prefix="crm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_DB_DIR) / 'crm.db'}"
+os.environ["DB_ASYNC"] = "false"
+os.environ["MAINTENANCE_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_db() -> Iterator[None]:
+    """Apply every Alembic revision to the test database (no alembic.ini: keep test logging)."""
+    config = Config()
+    config.set_main_option("script_location", str(_ROOT / "alembic"))
+    command.upgrade(config, "head")
+    yield
+    from app.db.session import engine, read_engine
+
+    read_engine.dispose()
+    engine.dispose()
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client(migrated_db: None) -> Iterator[TestClient]:
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,24 @@
+"""Uploads that cannot be parsed are reported on the import page, not as server errors."""
+
+import csv
+
+from fastapi.testclient import TestClient
+
+
+def _upload(client: TestClient, filename: str, content: str) -> str:
+    response = client.post(
+        "/contacts/import", files={"file": (filename, content.encode(), "text/csv")}
+    )
+    assert response.status_code == 200
+    return response.text
+
+
+def test_csv_field_over_the_size_limit_is_a_format_error(client: TestClient) -> None:
+    oversized = "x" * (csv.field_size_limit() + 1)
+    text = _upload(client, "contacts.csv", f"full_name,email\nAda,ada@example.com\n{oversized},\n")
+    assert "Malformed CSV at line 3" in text
+
+
+def test_csv_without_full_name_column_is_a_format_error(client: TestClient) -> None:
+    text = _upload(client, "contacts.csv", "name,email\nAda,ada@example.com\n")
+    assert "CSV header must include a full_name column" in text
@@ -0,0 +1,103 @@
+"""The contact edit page and its validation-error re-render run a fixed number of queries,
+however many notes and activities the contact has."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import TIMELINE_PAGE_SIZE
+from app.db.session import SessionLocal, engine, read_engine
+from app.models import Activity, Company, Contact, Note
+
+# Statements per request: data versions (ETag), contact, its company, one timeline page (the
+# merged ids, then its notes and its activities). The re-render has no ETag check; instead
+# update_contact first loads the contact for its 404 check.
+EDIT_PAGE_MAX_QUERIES = 6
+ERROR_RERENDER_MAX_QUERIES = 6
+
+
+@contextmanager
+def count_queries() -> Iterator[list[str]]:
+    """Collect every statement executed on the writer and read-only engines inside the block."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    binds = {engine, read_engine}
+    for bind in binds:
+        event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for bind in binds:
+            event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def _create_contact(history: int) -> int:
+    """A contact linked to a company, with `history` notes and as many activities, alternating."""
+    with SessionLocal() as db:
+        contact = Contact(
+            full_name=f"Query count {history}",
+            email="count@example.com",
+            company_ref=Company(name=f"Query Count Co {history}"),
+        )
+        started = datetime(2026, 1, 1)
+        for index in range(history):
+            # Interleaved, so a timeline page holds both notes and activities
+            noted_at = started + timedelta(hours=index, minutes=30)
+            contact.notes.append(Note(content=f"note {index}", created_at=noted_at))
+            contact.activities.append(
+                Activity(
+                    type="call",
+                    description=f"call {index}",
+                    activity_date=started + timedelta(hours=index),
+                )
+            )
+        db.add(contact)
+        db.commit()
+        return contact.id
+
+
+@pytest.fixture(scope="module")
+def contact_ids(client: TestClient) -> dict[str, int]:
+    ids = {"empty": _create_contact(0), "long": _create_contact(2 * TIMELINE_PAGE_SIZE)}
+    # First requests pay one-off lookups (FTS availability, ...) that are not per-request cost
+    for contact_id in ids.values():
+        client.get(f"/contacts/{contact_id}/edit")
+    return ids
+
+
+def _edit_page_queries(client: TestClient, contact_id: int) -> list[str]:
+    with count_queries() as statements:
+        response = client.get(f"/contacts/{contact_id}/edit")
+    assert response.status_code == 200
+    return statements
+
+
+def _error_rerender_queries(client: TestClient, contact_id: int) -> list[str]:
+    with count_queries() as statements:
+        response = client.post(f"/contacts/{contact_id}", data={"full_name": "", "email": ""})
+    assert response.status_code == 200
+    assert "list-disc" in response.text  # the validation errors are shown
+    return statements
+
+
+def test_edit_page_query_count(client: TestClient, contact_ids: dict[str, int]) -> None:
+    empty = _edit_page_queries(client, contact_ids["empty"])
+    long = _edit_page_queries(client, contact_ids["long"])
+    assert len(long) <= EDIT_PAGE_MAX_QUERIES, long
+    assert len(empty) <= len(long)
+
+
+def test_update_contact_error_rerender_query_count(
+    client: TestClient, contact_ids: dict[str, int]
+) -> None:
+    empty = _error_rerender_queries(client, contact_ids["empty"])
+    long = _error_rerender_queries(client, contact_ids["long"])
+    assert len(long) <= ERROR_RERENDER_MAX_QUERIES, long
+    assert len(empty) <= len(long)
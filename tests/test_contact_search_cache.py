@@ -0,0 +1,28 @@
+"""The search result cache drops its entries when the data a search matches against changes."""
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.models import Company, Contact
+
+
+def _search(client: TestClient, q: str) -> str:
+    response = client.get("/contacts", params={"q": q}, headers={"HX-Request": "true"})
+    assert response.status_code == 200
+    return response.text
+
+
+def test_company_rename_is_visible_to_the_next_search(client: TestClient) -> None:
+    with SessionLocal() as db:
+        company = Company(name="Renamed Later Ltd")
+        db.add(Contact(full_name="Rename Probe", company_ref=company))
+        db.commit()
+        company_id = company.id
+
+    # The contacts full-text index also covers the linked company's name
+    assert "Rename Probe" not in _search(client, "quokka")
+    response = client.post(
+        f"/companies/{company_id}", data={"name": "Quokka Labs"}, follow_redirects=False
+    )
+    assert response.status_code == 303
+    assert "Rename Probe" in _search(client, "quokka")
@@ -0,0 +1,20 @@
+"""EXPLAIN QUERY PLAN guard: the contacts list and contact page statements stay on their
+indexes (no full table scan, no temp B-tree sort), as `python -m app.cli check-query-plans`."""
+
+import pytest
+
+from app.cli import QUERY_PLAN_SCENARIOS, explain_scenario, query_plan_session
+from app.db.query_plans import query_plan_problems
+
+
+@pytest.mark.parametrize("scenario", QUERY_PLAN_SCENARIOS)
+def test_query_plan_uses_indexes(scenario: str) -> None:
+    with query_plan_session() as db:
+        explained = explain_scenario(db, QUERY_PLAN_SCENARIOS[scenario])
+    assert explained, "the scenario executed no statement"
+    problems = {
+        " ".join(statement.split()): query_plan_problems(plan)
+        for statement, plan in explained
+        if query_plan_problems(plan)
+    }
+    assert not problems